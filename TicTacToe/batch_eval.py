@@ -0,0 +1,112 @@
+import numpy as np
+
+from board import Board, win_lines
+
+# Cell values in the array form of a board
+EMPTY = 0
+X = 1
+O = 2
+
+# Upper bound on the temporary line arrays built per chunk of boards
+_CHUNK_BYTES = 32 * 1024 * 1024
+
+def evaluate_boards(boards, win_length=None):
+    """
+    Evaluate many boards at once.
+    
+    The rules are those of board.Board: a player wins with win_length marks
+    in a row, column or diagonal. Boards are processed in vectorized chunks,
+    so millions of positions can be scored without a Python loop per board.
+    If a board has more than one completed line, the line with the lowest
+    index is reported.
+    
+    Args:
+        boards (numpy.ndarray): An (N, size, size) integer array of EMPTY, X and O
+        win_length (int): The number of marks in a row needed to win
+                          (defaults to the board size)
+    
+    Returns:
+        tuple: Three arrays of length N:
+               winners (int8) - X, O, or EMPTY if there's no winner
+               lines (int32) - the index of the winning line in
+                               board.win_lines(size, win_length), or -1
+               full (bool) - whether every square is marked
+    """
+    boards = np.asarray(boards)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"Expected an (N, size, size) array, got shape {boards.shape}")
+    
+    count, size = boards.shape[0], boards.shape[1]
+    if win_length is None:
+        win_length = size
+    if not 1 <= win_length <= size:
+        raise ValueError(f"win_length must be between 1 and {size}, got {win_length}")
+    
+    flat = boards.reshape(count, size * size).astype(np.int8, copy=False)
+    line_cells = np.array(win_lines(size, win_length), dtype=np.intp)
+    
+    winners = np.zeros(count, dtype=np.int8)
+    lines = np.full(count, -1, dtype=np.int32)
+    full = (flat != EMPTY).all(axis=1)
+    
+    chunk = max(1, _CHUNK_BYTES // line_cells.size)
+    for start in range(0, count, chunk):
+        values = flat[start:start + chunk][:, line_cells]
+        first = values[:, :, 0]
+        complete = (values == first[:, :, None]).all(axis=2) & (first != EMPTY)
+        has_winner = complete.any(axis=1)
+        line = complete.argmax(axis=1)
+        rows = np.arange(len(line))
+        winners[start:start + chunk] = np.where(has_winner, first[rows, line], EMPTY)
+        lines[start:start + chunk] = np.where(has_winner, line, -1)
+    
+    return winners, lines, full
+
+def board_to_array(board, symbols=('X', 'O')):
+    """
+    Convert a Board to its array form.
+    
+    Args:
+        board (Board): The board to convert
+        symbols (tuple): The symbols stored as X and O
+    
+    Returns:
+        numpy.ndarray: A (size, size) int8 array of EMPTY, X and O
+    """
+    size = board.size
+    cells = np.zeros(size * size, dtype=np.int8)
+    for value, symbol in ((X, symbols[0]), (O, symbols[1])):
+        bits = board.get_bits(symbol)
+        if bits:
+            marked = [cell for cell in range(size * size) if bits >> cell & 1]
+            cells[marked] = value
+    return cells.reshape(size, size)
+
+def boards_to_array(boards, symbols=('X', 'O')):
+    """Convert a sequence of Boards of the same size to an (N, size, size) array."""
+    return np.stack([board_to_array(board, symbols) for board in boards])
+
+def array_to_board(array, win_length=None, symbols=('X', 'O')):
+    """
+    Convert the array form of a board back to a Board.
+    
+    Args:
+        array (numpy.ndarray): A (size, size) array of EMPTY, X and O
+        win_length (int): The number of marks in a row needed to win
+                          (defaults to the board size)
+        symbols (tuple): The symbols stored as X and O
+    
+    Returns:
+        Board: The board, with the marks added in row-major order
+    """
+    array = np.asarray(array)
+    if array.ndim != 2 or array.shape[0] != array.shape[1]:
+        raise ValueError(f"Expected a (size, size) array, got shape {array.shape}")
+    
+    board = Board(array.shape[0], win_length)
+    for (row, col), value in np.ndenumerate(array):
+        if value == X:
+            board.mark_square(row, col, symbols[0])
+        elif value == O:
+            board.mark_square(row, col, symbols[1])
+    return board
\ No newline at end of file
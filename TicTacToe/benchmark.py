@@ -0,0 +1,296 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from board import Board
+from game import TicTacToeGame
+from game_logger import BufferedGameLogger, GameLogger, NullLogger
+from structured_log import StructuredGameLogger
+
+DEFAULT_SIZES = (3, 4, 5, 7, 10, 15, 20, 25)
+DEFAULT_FRAME_SIZES = (3, 10, 25)
+
+def _rate(function, min_time):
+    """
+    Time a function repeatedly until at least min_time seconds have passed.
+    
+    Args:
+        function (callable): A function that does some work and returns the
+                             number of operations it did
+        min_time (float): The minimum number of seconds to run for
+    
+    Returns:
+        float: The number of operations per second
+    """
+    operations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        operations += function()
+        elapsed = time.perf_counter() - start
+    return operations / elapsed
+
+def _result(value, unit, higher_is_better=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def _random_cells(size, rng):
+    cells = list(range(size * size))
+    rng.shuffle(cells)
+    return cells
+
+def bench_moves(size, min_time, rng):
+    """
+    Measure how fast moves are made and win checks are answered on a board.
+    
+    Every move fills the board in a random order, ignoring wins, so each
+    move pays for the incremental win check along the way.
+    
+    Returns:
+        dict: Results named moves_per_second and win_checks_per_second
+    """
+    orders = [_random_cells(size, rng) for _ in range(8)]
+    
+    def fill():
+        board = Board(size)
+        for cell in orders[rng.randrange(len(orders))]:
+            board.mark_square(cell // size, cell % size, 'X' if board.ply % 2 == 0 else 'O')
+        return size * size
+    
+    board = Board(size)
+    for cell in orders[0][:size * size // 2]:
+        board.mark_square(cell // size, cell % size, 'X' if board.ply % 2 == 0 else 'O')
+    
+    def check():
+        for _ in range(1000):
+            board.get_winner()
+            board.is_full()
+        return 1000
+    
+    return {
+        "moves_per_second": _result(_rate(fill, min_time), "moves/s"),
+        "win_checks_per_second": _result(_rate(check, min_time), "checks/s")
+    }
+
+def bench_games(size, min_time, rng):
+    """Measure how many random games of TicTacToeGame are played per second."""
+    logger = NullLogger()
+    
+    def play():
+        game = TicTacToeGame(board_size=size, logger=logger)
+        for cell in _random_cells(size, rng):
+            game.make_move(cell // size, cell % size)
+            if game.is_game_over:
+                break
+        return 1
+    
+    return {"games_per_second": _result(_rate(play, min_time), "games/s")}
+
+def bench_loggers(min_time, directory):
+    """
+    Measure how many results each logger accepts per second.
+    
+    The buffered logger is timed until everything it accepted is on disk.
+    
+    Returns:
+        dict: A results-per-second result for each logger
+    """
+    game = TicTacToeGame("Alice", "Bob", logger=NullLogger())
+    for row, col in ((0, 0), (1, 0), (0, 1), (1, 1), (0, 2)):
+        game.make_move(row, col)
+    player1, player2 = game.players
+    winner = game.winner
+    history = game.history
+    
+    results = {}
+    loggers = (
+        ("game_logger", lambda path: GameLogger(path)),
+        ("buffered_game_logger", lambda path: BufferedGameLogger(path)),
+        ("structured_game_logger", lambda path: StructuredGameLogger(path))
+    )
+    for name, factory in loggers:
+        logger = factory(os.path.join(directory, name + ".log"))
+        
+        def log():
+            for _ in range(100):
+                logger.log_result(player1, player2, winner, history=history)
+            return 100
+        
+        start = time.perf_counter()
+        count = 0
+        while time.perf_counter() - start < min_time:
+            count += log()
+        if isinstance(logger, BufferedGameLogger):
+            logger.flush()
+        elapsed = time.perf_counter() - start
+        close = getattr(logger, "close", None)
+        if close is not None:
+            close()
+        results[f"{name}_results_per_second"] = _result(count / elapsed, "results/s")
+    return results
+
+def bench_frames(sizes, frames, directory, rng):
+    """
+    Measure the time GameUI._draw_game takes on a headless display.
+    
+    SDL's dummy video driver is used, so no window is opened. Each board is
+    drawn half full.
+    
+    Returns:
+        dict: Mean and 95th percentile frame times in milliseconds per board size
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from game_ui import GameUI
+    
+    ui = GameUI(log_file=os.path.join(directory, "frames.log"),
+                font_cache_file=os.path.join(directory, "fonts.json"))
+    results = {}
+    try:
+        for size in sizes:
+            ui._game = TicTacToeGame(board_size=size, logger=NullLogger())
+            for cell in _random_cells(size, rng)[:size * size // 2]:
+                if ui._game.is_game_over:
+                    break
+                ui._game.make_move(cell // size, cell % size)
+            ui._setup_game_elements()
+            ui._state = ui.GAME
+            
+            ui._draw_game()
+            times = []
+            for _ in range(frames):
+                start = time.perf_counter()
+                ui._draw_game()
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            results[f"draw_game_{size}x{size}_mean_ms"] = _result(
+                statistics.fmean(times), "ms", higher_is_better=False)
+            results[f"draw_game_{size}x{size}_p95_ms"] = _result(
+                times[min(len(times) - 1, int(len(times) * 0.95))], "ms", higher_is_better=False)
+    finally:
+        ui._logger.close()
+        ui._stats.close()
+        pygame.quit()
+    return results
+
+def run_benchmarks(sizes=DEFAULT_SIZES, frame_sizes=DEFAULT_FRAME_SIZES, min_time=0.5,
+                   frames=200, seed=0, include_frames=True):
+    """
+    Run the benchmark suite.
+    
+    Args:
+        sizes (tuple): The board sizes for the move and game benchmarks
+        frame_sizes (tuple): The board sizes for the frame benchmark
+        min_time (float): The minimum number of seconds to time each benchmark
+        frames (int): The number of frames to time per board size
+        seed (int): The seed for the random moves
+        include_frames (bool): Whether to run the frame benchmark, which needs pygame
+    
+    Returns:
+        dict: The run's 'meta' information and its 'results', mapping each
+              benchmark name to its value, unit and direction
+    """
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name, result in bench_moves(size, min_time, rng).items():
+                results[f"board_{size}x{size}_{name}"] = result
+            for name, result in bench_games(size, min_time, rng).items():
+                results[f"game_{size}x{size}_{name}"] = result
+        results.update(bench_loggers(min_time, directory))
+        if include_frames:
+            results.update(bench_frames(frame_sizes, frames, directory, rng))
+    
+    meta = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "min_time": min_time
+    }
+    return {"meta": meta, "results": results}
+
+def compare(current, baseline, threshold=0.1):
+    """
+    Compare a benchmark run with a baseline.
+    
+    Args:
+        current (dict): The results of run_benchmarks()
+        baseline (dict): Earlier results of run_benchmarks()
+        threshold (float): The relative change that counts as a regression
+                           or an improvement
+    
+    Returns:
+        tuple: The lines of a report and the names of the regressed benchmarks
+    """
+    lines = [f"{'benchmark':48} {'baseline':>14} {'current':>14} {'change':>8}"]
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            lines.append(f"{name:48} {'-':>14} {result['value']:14.4g} {'new':>8}")
+            continue
+        change = result["value"] / base["value"] - 1
+        # A positive gain is an improvement whichever direction is better
+        gain = change if result["higher_is_better"] else -change
+        marker = ""
+        if gain < -threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        elif gain > threshold:
+            marker = "  improved"
+        lines.append(f"{name:48} {base['value']:14.4g} {result['value']:14.4g} "
+                     f"{change:+8.1%}{marker}")
+    return lines, regressions
+
+def main(argv=None):
+    """Parse the command line, run the benchmarks and save or compare the results."""
+    parser = argparse.ArgumentParser(description="Benchmark the game logic, loggers and drawing.")
+    parser.add_argument("--output", default=None,
+                        help="write the results to this JSON file (printed if not given)")
+    parser.add_argument("--compare", default=None, metavar="BASELINE",
+                        help="compare the results with a JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative slowdown reported as a regression (default 0.1)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="board sizes for the move and game benchmarks")
+    parser.add_argument("--frame-sizes", type=int, nargs="+", default=list(DEFAULT_FRAME_SIZES),
+                        help="board sizes for the frame benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="minimum seconds to time each benchmark")
+    parser.add_argument("--frames", type=int, default=200, help="frames to time per board size")
+    parser.add_argument("--no-frames", action="store_true",
+                        help="skip the frame benchmark, which needs pygame")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+    
+    if any(size < 1 for size in args.sizes + args.frame_sizes):
+        parser.error("board sizes must be at least 1")
+    
+    current = run_benchmarks(args.sizes, args.frame_sizes, args.min_time, args.frames,
+                             args.seed, not args.no_frames)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    elif not args.compare:
+        print(json.dumps(current, indent=2))
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(current, baseline, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
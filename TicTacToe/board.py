@@ -1,26 +1,309 @@
+import random
+from array import array
+
 from square import Square
 
+# Cache of winning lines and their bitmasks, keyed by (size, win_length)
+_WIN_LINES = {}
+_WIN_MASKS = {}
+
+# Cache of Zobrist keys, keyed by (size, symbol)
+_ZOBRIST_KEYS = {}
+
+# Cache of the Zobrist keys of each cell under every symmetry, keyed by (size, symbol)
+_SYMMETRY_KEYS = {}
+
+# Cache of the cell permutations of the board symmetries, keyed by size
+_SYMMETRIES = {}
+
+# Row and column steps for horizontal, vertical, diagonal and anti-diagonal lines
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+def win_lines(size, win_length=None):
+    """
+    Get the winning lines for a board of the given size.
+    
+    A winning line is any run of win_length consecutive cells in a row, a
+    column or a diagonal. Cells are numbered row by row, so the cell at
+    (row, col) has index row * size + col. Lines are ordered by direction
+    (horizontal, vertical, diagonal, anti-diagonal) and then by the
+    position of their first cell.
+    
+    Args:
+        size (int): The size of the board
+        win_length (int): The number of marks in a row needed to win
+                          (defaults to the board size)
+    
+    Returns:
+        list: A list of tuples of cell indices, one tuple per line
+    """
+    if win_length is None:
+        win_length = size
+    lines = _WIN_LINES.get((size, win_length))
+    if lines is None:
+        lines = []
+        for dr, dc in DIRECTIONS:
+            for row in range(size):
+                for col in range(size):
+                    end_row = row + dr * (win_length - 1)
+                    end_col = col + dc * (win_length - 1)
+                    if 0 <= end_row < size and 0 <= end_col < size:
+                        lines.append(tuple((row + dr * i) * size + col + dc * i
+                                           for i in range(win_length)))
+        _WIN_LINES[(size, win_length)] = lines
+    return lines
+
+def win_masks(size, win_length=None):
+    """
+    Get the bitmasks of the winning lines for a board of the given size.
+    
+    Args:
+        size (int): The size of the board
+        win_length (int): The number of marks in a row needed to win
+                          (defaults to the board size)
+    
+    Returns:
+        list: A list of integer bitmasks in the same order as win_lines()
+    """
+    if win_length is None:
+        win_length = size
+    masks = _WIN_MASKS.get((size, win_length))
+    if masks is None:
+        masks = []
+        for line in win_lines(size, win_length):
+            mask = 0
+            for cell in line:
+                mask |= 1 << cell
+            masks.append(mask)
+        _WIN_MASKS[(size, win_length)] = masks
+    return masks
+
+def symmetries(size):
+    """
+    Get the eight symmetries of a square board as cell permutations.
+    
+    Each permutation maps a cell index to the index that cell moves to under
+    the transform. The identity comes first, followed by the three rotations
+    and the four reflections.
+    
+    Args:
+        size (int): The size of the board
+    
+    Returns:
+        list: A list of eight tuples of cell indices
+    """
+    perms = _SYMMETRIES.get(size)
+    if perms is None:
+        last = size - 1
+        transforms = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, last - r),
+            lambda r, c: (last - r, last - c),
+            lambda r, c: (last - c, r),
+            lambda r, c: (r, last - c),
+            lambda r, c: (last - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (last - c, last - r)
+        )
+        perms = []
+        for transform in transforms:
+            perm = []
+            for cell in range(size * size):
+                r, c = transform(cell // size, cell % size)
+                perm.append(r * size + c)
+            perms.append(tuple(perm))
+        _SYMMETRIES[size] = perms
+    return perms
+
+def zobrist_keys(size, symbol):
+    """
+    Get the Zobrist keys for a symbol on a board of the given size.
+    
+    The keys are 64-bit random numbers seeded from the size and the symbol,
+    so every process generates the same keys and hashes can be compared
+    across processes.
+    
+    Args:
+        size (int): The size of the board
+        symbol (str): The symbol the keys are for
+    
+    Returns:
+        list: A list of integer keys indexed by cell
+    """
+    keys = _ZOBRIST_KEYS.get((size, symbol))
+    if keys is None:
+        rng = random.Random(f"zobrist:{size}:{symbol}")
+        keys = [rng.getrandbits(64) for _ in range(size * size)]
+        _ZOBRIST_KEYS[(size, symbol)] = keys
+    return keys
+
+def symmetry_keys(size, symbol):
+    """
+    Get the Zobrist keys of each cell under the eight board symmetries.
+    
+    XORing the keys at index t for every cell marked with a symbol gives the
+    Zobrist hash of the board transformed by symmetries(size)[t].
+    
+    Args:
+        size (int): The size of the board
+        symbol (str): The symbol the keys are for
+    
+    Returns:
+        list: A list indexed by cell of tuples of eight keys
+    """
+    keys = _SYMMETRY_KEYS.get((size, symbol))
+    if keys is None:
+        base = zobrist_keys(size, symbol)
+        perms = symmetries(size)
+        keys = [tuple(base[perm[cell]] for perm in perms) for cell in range(size * size)]
+        _SYMMETRY_KEYS[(size, symbol)] = keys
+    return keys
+
 class Board:
     """
     Represents the tic-tac-toe game board.
     
+    The board is stored as one integer bitmask per symbol, where bit
+    row * size + col is set when that symbol occupies the square. The result
+    is updated by every move: the board counts its filled squares and only
+    scans the four lines through the newly marked square for a win.
+    
+    The marked cells are also kept on a stack in the order they were marked,
+    so push() and pop() can make and take back moves in place during a
+    search without copying the board.
+    
+    Alongside its own Zobrist hash, the board keeps the hashes of its seven
+    rotations and reflections up to date. The smallest of the eight is the
+    canonical hash, which is the same for every board in a symmetry class.
+    
     Attributes:
         size (int): The size of the board (default is 3x3)
-        squares (list): A 2D list of Square objects
+        win_length (int): The number of marks in a row needed to win
+                          (defaults to the board size)
+        squares (list): A 2D list of Square objects, built on demand
     """
-    def __init__(self, size=3):
+    def __init__(self, size=3, win_length=None):
+        if win_length is None:
+            win_length = size
+        if not 1 <= win_length <= size:
+            raise ValueError(f"win_length must be between 1 and {size}, got {win_length}")
         self._size = size
-        self._squares = [[Square() for _ in range(size)] for _ in range(size)]
-        self._last_move = None
+        self._win_length = win_length
+        self._reset_state()
     
     @property
     def size(self):
         return self._size
     
+    @property
+    def win_length(self):
+        return self._win_length
+    
     @property
     def squares(self):
+        # The Square grid is only a view of the bitboards, so it is rebuilt
+        # lazily after the board changes
+        if self._squares is None:
+            self._squares = [[Square() for _ in range(self._size)] for _ in range(self._size)]
+            for symbol, bits in self._bits.items():
+                for cell in self._cells(bits):
+                    self._squares[cell // self._size][cell % self._size].mark(symbol)
         return self._squares
     
+    @property
+    def last_move(self):
+        if not self._moves:
+            return None
+        return divmod(self._moves[-1], self._size)
+    
+    @property
+    def ply(self):
+        """The number of marks made since the board was empty."""
+        return len(self._moves)
+    
+    @property
+    def zobrist_hash(self):
+        """A 64-bit Zobrist hash of the marks on the board."""
+        return self._hashes[0]
+    
+    @property
+    def symmetry_hashes(self):
+        """The Zobrist hashes of the board under each of symmetries(size)."""
+        return tuple(self._hashes)
+    
+    @property
+    def canonical_hash(self):
+        """The smallest Zobrist hash over the board's eight symmetries."""
+        return min(self._hashes)
+    
+    @property
+    def canonical_symmetry(self):
+        """The index in symmetries(size) of the transform that gives canonical_hash."""
+        return self._hashes.index(min(self._hashes))
+    
+    def copy(self):
+        """Create an independent copy of the board."""
+        board = Board.__new__(Board)
+        board._size = self._size
+        board._win_length = self._win_length
+        board._bits = dict(self._bits)
+        board._occupied = self._occupied
+        board._filled = self._filled
+        board._winner = self._winner
+        board._winning_positions = self._winning_positions
+        board._winner_ply = self._winner_ply
+        board._hashes = list(self._hashes)
+        board._keys = self._keys
+        board._squares = None
+        board._moves = array("H", self._moves)
+        return board
+    
+    def available_moves(self, near=None):
+        """
+        Get the positions of the empty squares.
+        
+        Args:
+            near (int or None): If given, only include squares within this many
+                                rows and columns of a mark (all empty squares
+                                are returned while the board is empty)
+        
+        Returns:
+            list: A list of (row, col) tuples in row-major order
+        """
+        size = self._size
+        empty = ~self._occupied & ((1 << (size * size)) - 1)
+        if near is not None and self._occupied:
+            area = 0
+            for cell in self._cells(self._occupied):
+                row, col = divmod(cell, size)
+                for r in range(max(0, row - near), min(size, row + near + 1)):
+                    for c in range(max(0, col - near), min(size, col + near + 1)):
+                        area |= 1 << (r * size + c)
+            empty &= area
+        return [(cell // size, cell % size) for cell in self._cells(empty)]
+    
+    def get_bits(self, symbol):
+        """Get the bitmask of the squares marked with the given symbol."""
+        return self._bits.get(symbol, 0)
+    
+    def get_value(self, row, col):
+        """
+        Get the symbol at the given position.
+        
+        Args:
+            row (int): The row index
+            col (int): The column index
+        
+        Returns:
+            str or None: The symbol at the position, or None if it's empty
+        """
+        bit = 1 << (row * self._size + col)
+        if self._occupied & bit:
+            for symbol, bits in self._bits.items():
+                if bits & bit:
+                    return symbol
+        return None
+    
     def mark_square(self, row, col, symbol):
         """
         Mark a square at the given position with the given symbol.
@@ -29,26 +312,169 @@ class Board:
             row (int): The row index
             col (int): The column index
             symbol (str): The symbol to mark ('X' or 'O')
-            
+        
         Returns:
             bool: True if the square was marked successfully, False otherwise
         """
         if 0 <= row < self._size and 0 <= col < self._size:
-            if self._squares[row][col].mark(symbol):
-                self._last_move = (row, col)
+            bit = 1 << (row * self._size + col)
+            if not self._occupied & bit:
+                self._bits[symbol] = self._bits.get(symbol, 0) | bit
+                self._occupied |= bit
+                self._filled += 1
+                self._toggle_hashes(row * self._size + col, symbol)
+                self._squares = None
+                self._moves.append(row * self._size + col)
+                if self._winner is None:
+                    self._check_win(row, col, symbol)
                 return True
         return False
     
+    def push(self, cell, symbol):
+        """
+        Mark an empty square for a search, to be taken back with pop().
+        
+        Unlike mark_square, the move isn't checked, so the cell must be on
+        the board and empty.
+        
+        Args:
+            cell (int): The index of the square, row * size + col
+            symbol (str): The symbol to mark
+        """
+        bit = 1 << cell
+        self._bits[symbol] = self._bits.get(symbol, 0) | bit
+        self._occupied |= bit
+        self._filled += 1
+        self._toggle_hashes(cell, symbol)
+        self._squares = None
+        self._moves.append(cell)
+        if self._winner is None:
+            self._check_win(cell // self._size, cell % self._size, symbol)
+    
+    def pop(self):
+        """
+        Take back the last mark, restoring the board exactly as it was before it.
+        
+        Returns:
+            int: The index of the square that was cleared
+        """
+        if self._winner_ply == len(self._moves):
+            self._winner = None
+            self._winning_positions = None
+            self._winner_ply = None
+        cell = self._moves.pop()
+        bit = 1 << cell
+        for symbol, bits in self._bits.items():
+            if bits & bit:
+                self._bits[symbol] = bits ^ bit
+                break
+        self._occupied ^= bit
+        self._filled -= 1
+        self._toggle_hashes(cell, symbol)
+        self._squares = None
+        return cell
+    
+    def unmark_square(self, row, col):
+        """
+        Remove the mark at the given position, undoing mark_square.
+        
+        Removing the last mark is the same as pop(). Any other mark is taken
+        out of the move order, and the result is cleared if the mark was part
+        of the winning run.
+        
+        Args:
+            row (int): The row index
+            col (int): The column index
+        
+        Returns:
+            bool: True if a mark was removed, False if the square was empty
+        """
+        if not (0 <= row < self._size and 0 <= col < self._size):
+            return False
+        cell = row * self._size + col
+        if not self._occupied >> cell & 1:
+            return False
+        if self._moves[-1] == cell:
+            self.pop()
+            return True
+        
+        symbol = self.get_value(row, col)
+        self._bits[symbol] ^= 1 << cell
+        self._occupied ^= 1 << cell
+        self._filled -= 1
+        self._toggle_hashes(cell, symbol)
+        self._squares = None
+        index = self._moves.index(cell)
+        del self._moves[index]
+        if self._winning_positions is not None and (row, col) in self._winning_positions:
+            self._winner = None
+            self._winning_positions = None
+            self._winner_ply = None
+        elif self._winner_ply is not None and index < self._winner_ply:
+            self._winner_ply -= 1
+        return True
+    
     def is_full(self):
         """Check if the board is full."""
-        return all(not square.is_empty for row in self._squares for square in row)
+        return self._filled == self._size * self._size
     
     def reset(self):
         """Reset the board to its initial state."""
-        for row in self._squares:
-            for square in row:
-                square.reset()
-        self._last_move = None
+        self._reset_state()
+    
+    def _reset_state(self):
+        """Clear the marks and the incremental result tracking."""
+        self._bits = {}
+        self._occupied = 0
+        self._filled = 0
+        self._winner = None
+        self._winning_positions = None
+        self._winner_ply = None
+        self._hashes = [0] * 8
+        self._keys = {}
+        self._squares = None
+        self._moves = array("H")
+    
+    def _toggle_hashes(self, cell, symbol):
+        """Add or remove a mark at cell in the hashes of every symmetry."""
+        symbol_keys = self._keys.get(symbol)
+        if symbol_keys is None:
+            symbol_keys = self._keys[symbol] = symmetry_keys(self._size, symbol)
+        keys = symbol_keys[cell]
+        # Updated in place and unrolled, so marking a square allocates nothing
+        hashes = self._hashes
+        hashes[0] ^= keys[0]
+        hashes[1] ^= keys[1]
+        hashes[2] ^= keys[2]
+        hashes[3] ^= keys[3]
+        hashes[4] ^= keys[4]
+        hashes[5] ^= keys[5]
+        hashes[6] ^= keys[6]
+        hashes[7] ^= keys[7]
+    
+    def _check_win(self, row, col, symbol):
+        """Scan the four lines through (row, col) for a winning run of symbol."""
+        bits = self._bits[symbol]
+        size = self._size
+        for dr, dc in DIRECTIONS:
+            # Count the run of marks on both sides of the new square
+            forward = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < size and 0 <= c < size and bits >> (r * size + c) & 1:
+                forward += 1
+                r, c = r + dr, c + dc
+            backward = 0
+            r, c = row - dr, col - dc
+            while 0 <= r < size and 0 <= c < size and bits >> (r * size + c) & 1:
+                backward += 1
+                r, c = r - dr, c - dc
+            if forward + backward + 1 >= self._win_length:
+                self._winner = symbol
+                self._winner_ply = len(self._moves)
+                self._winning_positions = [
+                    (row + dr * i, col + dc * i) for i in range(-backward, forward + 1)
+                ]
+                return
     
     def get_winner(self):
         """
@@ -57,27 +483,7 @@ class Board:
         Returns:
             str or None: The winning symbol ('X' or 'O') or None if there's no winner
         """
-        # Check rows
-        for row in self._squares:
-            if all(square.value == row[0].value and not square.is_empty for square in row):
-                return row[0].value
-        
-        # Check columns
-        for col in range(self._size):
-            if all(self._squares[row][col].value == self._squares[0][col].value and 
-                   not self._squares[row][col].is_empty for row in range(self._size)):
-                return self._squares[0][col].value
-        
-        # Check diagonals
-        if all(self._squares[i][i].value == self._squares[0][0].value and 
-               not self._squares[i][i].is_empty for i in range(self._size)):
-            return self._squares[0][0].value
-        
-        if all(self._squares[i][self._size - 1 - i].value == self._squares[0][self._size - 1].value and 
-               not self._squares[i][self._size - 1 - i].is_empty for i in range(self._size)):
-            return self._squares[0][self._size - 1].value
-        
-        return None
+        return self._winner
     
     def get_winning_positions(self):
         """
@@ -87,24 +493,14 @@ class Board:
             list or None: A list of (row, col) tuples representing the winning positions,
                          or None if there's no winner
         """
-        # Check rows
-        for i, row in enumerate(self._squares):
-            if all(square.value == row[0].value and not square.is_empty for square in row):
-                return [(i, j) for j in range(self._size)]
-        
-        # Check columns
-        for col in range(self._size):
-            if all(self._squares[row][col].value == self._squares[0][col].value and 
-                   not self._squares[row][col].is_empty for row in range(self._size)):
-                return [(row, col) for row in range(self._size)]
-        
-        # Check diagonals
-        if all(self._squares[i][i].value == self._squares[0][0].value and 
-               not self._squares[i][i].is_empty for i in range(self._size)):
-            return [(i, i) for i in range(self._size)]
-        
-        if all(self._squares[i][self._size - 1 - i].value == self._squares[0][self._size - 1].value and 
-               not self._squares[i][self._size - 1 - i].is_empty for i in range(self._size)):
-            return [(i, self._size - 1 - i) for i in range(self._size)]
-        
-        return None
\ No newline at end of file
+        if self._winning_positions is None:
+            return None
+        return list(self._winning_positions)
+    
+    @staticmethod
+    def _cells(bits):
+        """Yield the indices of the set bits in ascending order."""
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
\ No newline at end of file
@@ -0,0 +1,288 @@
+import time
+
+from board import DIRECTIONS, win_masks
+from player import Player
+from symmetry_cache import CanonicalCache
+
+class SearchBudgetExceeded(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+
+class ComputerPlayer(Player):
+    """
+    A computer player that chooses its moves with a negamax search.
+    
+    The search uses alpha-beta pruning with iterative deepening, orders
+    moves by the transposition table and by how much each move extends or
+    blocks a line, and stores results in a transposition table keyed by the
+    board's Zobrist hash. Each move is limited by a time budget and an
+    optional node budget; when the budget runs out the best move of the
+    deepest completed iteration is played. Static evaluations are cached by
+    canonical hash, so rotated and reflected positions are only scored
+    once. On the standard 3x3 board a tablebase, if one is given, answers
+    instantly instead, and so does an opening book, if one is given, until
+    the game leaves it.
+    
+    Attributes:
+        symbol (str): The player's symbol ('X' or 'O')
+        name (str): The player's name
+        time_limit (float or None): The number of seconds allowed per move
+        node_limit (int or None): The number of nodes allowed per move
+        max_depth (int or None): The maximum search depth in moves
+    """
+    WIN_SCORE = 10 ** 9
+    
+    # Scores within this distance of WIN_SCORE are wins or losses found by
+    # the search, adjusted by the number of moves needed to reach them
+    _WIN_THRESHOLD = WIN_SCORE - 10 ** 6
+    
+    # Transposition table entry flags
+    _EXACT = 0
+    _LOWER = 1
+    _UPPER = 2
+    
+    def __init__(self, symbol, name=None, time_limit=1.0, node_limit=None, max_depth=None,
+                 table_size=1000000, neighbourhood=2, tablebase=None, opening_book=None,
+                 book_min_games=10):
+        super().__init__(symbol, name if name else f"Computer {symbol}")
+        self._opponent = 'O' if symbol == 'X' else 'X'
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_depth = max_depth
+        self._table_size = table_size
+        self._neighbourhood = neighbourhood
+        self._tablebase = tablebase
+        self._opening_book = opening_book
+        self._book_min_games = book_min_games
+        self._table = {}
+        self._eval_cache = CanonicalCache(table_size)
+        self._masks = []
+        self._nodes = 0
+        self._deadline = None
+    
+    @property
+    def is_computer(self):
+        return True
+    
+    @property
+    def time_limit(self):
+        return self._time_limit
+    
+    @property
+    def node_limit(self):
+        return self._node_limit
+    
+    @property
+    def max_depth(self):
+        return self._max_depth
+    
+    @property
+    def nodes_searched(self):
+        """The number of nodes searched for the last move."""
+        return self._nodes
+    
+    def choose_move(self, board):
+        """
+        Choose a move for this player on the given board.
+        
+        Args:
+            board (Board): The board to move on
+        
+        Returns:
+            tuple or None: The (row, col) position to mark, or None if the
+                           game on the board is already over
+        """
+        if board.get_winner() is not None or board.is_full():
+            return None
+        
+        if self._tablebase is not None:
+            result = self._tablebase.lookup(board)
+            if result is not None and result[1] is not None:
+                return result[1]
+        
+        if self._opening_book is not None:
+            move = self._opening_book.choose_move(board, self._book_min_games)
+            if move is not None:
+                return move
+        
+        # Moves are made and taken back on a private copy, which is left
+        # half-searched if the budget runs out
+        board = board.copy()
+        size = board.size
+        self._nodes = 0
+        self._deadline = time.perf_counter() + self._time_limit if self._time_limit else None
+        self._masks = win_masks(size, board.win_length)
+        if len(self._table) >= self._table_size:
+            self._table.clear()
+        
+        max_depth = len(board.available_moves())
+        if self._max_depth is not None:
+            max_depth = min(max_depth, self._max_depth)
+        
+        best_move = self._ordered_moves(board, self.symbol, self._opponent, None)[0]
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(board, depth, -self.WIN_SCORE, self.WIN_SCORE,
+                                      self.symbol, self._opponent, 0)
+            except SearchBudgetExceeded:
+                break
+            best_move = self._table[board.zobrist_hash][3]
+            # Stop early once the result of the game is known
+            if abs(score) >= self._WIN_THRESHOLD:
+                break
+        
+        return divmod(best_move, size)
+    
+    def _check_budget(self):
+        """Raise SearchBudgetExceeded if the node or time budget is used up."""
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise SearchBudgetExceeded()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchBudgetExceeded()
+    
+    def _negamax(self, board, depth, alpha, beta, me, opponent, ply):
+        """
+        Search the position with alpha-beta pruning.
+        
+        Returns:
+            int: The score of the position from the point of view of me
+        """
+        self._nodes += 1
+        if self._nodes & 255 == 0 or self._node_limit is not None:
+            self._check_budget()
+        
+        # A winner can only be the player who just moved
+        if board.get_winner() is not None:
+            return -(self.WIN_SCORE - ply)
+        if board.is_full():
+            return 0
+        if depth == 0:
+            # The evaluation is the same for every symmetry of the position
+            value = self._eval_cache.get(board, None, me)
+            if value is None:
+                value = self._evaluate(board, me, opponent)
+                self._eval_cache.put(board, value, me)
+            return value
+        
+        key = board.zobrist_hash
+        entry = self._table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, table_move = entry
+            if entry_depth >= depth and ply > 0:
+                value = self._from_table(entry_value, ply)
+                if entry_flag == self._EXACT:
+                    return value
+                if entry_flag == self._LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        
+        original_alpha = alpha
+        best_value = -self.WIN_SCORE - 1
+        best_move = None
+        for cell in self._ordered_moves(board, me, opponent, table_move):
+            board.push(cell, me)
+            value = -self._negamax(board, depth - 1, -beta, -alpha, opponent, me, ply + 1)
+            board.pop()
+            if value > best_value:
+                best_value = value
+                best_move = cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+        
+        if best_value <= original_alpha:
+            flag = self._UPPER
+        elif best_value >= beta:
+            flag = self._LOWER
+        else:
+            flag = self._EXACT
+        self._table[key] = (depth, self._to_table(best_value, ply), flag, best_move)
+        return best_value
+    
+    def _to_table(self, value, ply):
+        """Make a win or loss score relative to the stored position."""
+        if value >= self._WIN_THRESHOLD:
+            return value + ply
+        if value <= -self._WIN_THRESHOLD:
+            return value - ply
+        return value
+    
+    def _from_table(self, value, ply):
+        """Make a stored win or loss score relative to the root again."""
+        if value >= self._WIN_THRESHOLD:
+            return value - ply
+        if value <= -self._WIN_THRESHOLD:
+            return value + ply
+        return value
+    
+    def _evaluate(self, board, me, opponent):
+        """Score a position by the open lines each player has started."""
+        mine = board.get_bits(me)
+        theirs = board.get_bits(opponent)
+        score = 0
+        for mask in self._masks:
+            own = mine & mask
+            other = theirs & mask
+            if own and not other:
+                score += 1 << (2 * own.bit_count())
+            elif other and not own:
+                score -= 1 << (2 * other.bit_count())
+        return score
+    
+    def _ordered_moves(self, board, me, opponent, table_move):
+        """
+        Get the candidate moves as cell indices, most promising first.
+        
+        On boards where a line is shorter than the board, only squares near
+        existing marks are considered.
+        """
+        size = board.size
+        win_length = board.win_length
+        mine = board.get_bits(me)
+        theirs = board.get_bits(opponent)
+        near = self._neighbourhood if win_length < size else None
+        cells = [row * size + col for row, col in board.available_moves(near)]
+        
+        center = (size - 1) / 2
+        scored = []
+        for cell in cells:
+            row, col = divmod(cell, size)
+            own_run = self._longest_run(mine, size, row, col)
+            their_run = self._longest_run(theirs, size, row, col)
+            # Completing a line beats blocking one, which beats everything else
+            if own_run + 1 >= win_length:
+                priority = 2
+            elif their_run + 1 >= win_length:
+                priority = 1
+            else:
+                priority = 0
+            distance = abs(row - center) + abs(col - center)
+            scored.append((-priority, -(own_run + their_run), distance, cell))
+        scored.sort()
+        moves = [cell for _, _, _, cell in scored]
+        
+        if table_move is not None and table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+        return moves
+    
+    @staticmethod
+    def _longest_run(bits, size, row, col):
+        """Get the longest run of marks in bits that (row, col) would join."""
+        longest = 0
+        for dr, dc in DIRECTIONS:
+            run = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < size and 0 <= c < size and bits >> (r * size + c) & 1:
+                run += 1
+                r, c = r + dr, c + dc
+            r, c = row - dr, col - dc
+            while 0 <= r < size and 0 <= c < size and bits >> (r * size + c) & 1:
+                run += 1
+                r, c = r - dr, c - dc
+            longest = max(longest, run)
+        return longest
\ No newline at end of file
@@ -0,0 +1,84 @@
+import json
+import os
+
+import pygame
+
+DEFAULT_FONT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "tictactoe", "fonts.json")
+
+class FontCache:
+    """
+    Loads system fonts by name, remembering where each font file is on disk.
+    
+    Finding a system font by name makes pygame list every font installed,
+    which is slow on machines with many fonts. The file each name resolves
+    to is saved in a JSON cache file, so later runs open the file directly
+    and never list the system fonts. An entry is looked up again if its
+    file has gone.
+    """
+    def __init__(self, path=DEFAULT_FONT_CACHE_FILE):
+        self._path = path
+        self._entries = {}
+        self._changed = False
+        try:
+            with open(path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+    
+    @property
+    def path(self):
+        return self._path
+    
+    def get_font(self, name, size, bold=False):
+        """
+        Load a system font, like pygame.font.SysFont.
+        
+        Args:
+            name (str): The name of the font
+            size (int): The size of the font
+            bold (bool): Whether to use the bold face
+        
+        Returns:
+            pygame.font.Font: The font, or pygame's default font if it isn't
+                              installed
+        """
+        key = f"{name}|{'bold' if bold else 'regular'}"
+        entry = self._entries.get(key)
+        if entry is None or (entry["path"] is not None and not os.path.exists(entry["path"])):
+            entry = self._resolve(name, bold)
+            self._entries[key] = entry
+            self._changed = True
+        
+        font = pygame.font.Font(entry["path"], size)
+        if entry["synthetic_bold"]:
+            font.set_bold(True)
+        return font
+    
+    @staticmethod
+    def _resolve(name, bold):
+        """Find the file of a font and whether bold has to be drawn by pygame."""
+        path = pygame.font.match_font(name, bold=bold)
+        # Without a separate bold face, the regular one is made bold when drawn
+        synthetic_bold = bold and (path is None or path == pygame.font.match_font(name))
+        return {"path": path, "synthetic_bold": synthetic_bold}
+    
+    def save(self):
+        """
+        Write any newly resolved fonts to the cache file.
+        
+        Returns:
+            bool: True if the cache is up to date on disk, False otherwise
+        """
+        if not self._changed:
+            return True
+        try:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self._path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            self._changed = False
+            return True
+        except Exception as e:
+            print(f"Error writing font cache: {e}")
+            return False
\ No newline at end of file
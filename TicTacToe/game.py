@@ -1,30 +1,42 @@
+import struct
+
 from board import Board
 from player import Player
 from game_history import GameHistory
 from game_logger import GameLogger
 
+# Snapshot header: magic, version, board size, win length, current player
+# index and flags
+_SNAPSHOT_HEADER = struct.Struct("<4sBBBBB")
+_SNAPSHOT_MAGIC = b"TTTG"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_RESULT_LOGGED = 1
+
 class TicTacToeGame:
     """
     Represents a tic-tac-toe game.
     
     Attributes:
-        board (Board): The game board
+        board (Board): The game board, where win_length marks in a row win
         players (list): A list of Player objects
         current_player_index (int): The index of the current player
         history (GameHistory): The game history
     """
-    def __init__(self, player1_name=None, player2_name=None, board_size=3, logger=None):
-        self._board = Board(board_size)
-        self._players = [
+    def __init__(self, player1_name=None, player2_name=None, board_size=3, logger=None,
+                 win_length=None, players=None):
+        self._board = Board(board_size, win_length)
+        # Explicit Player objects (such as computer players) replace the named ones
+        self._players = list(players) if players else [
             Player('X', player1_name),
             Player('O', player2_name)
         ]
         self._current_player_index = 0
-        self._history = GameHistory()
+        self._history = GameHistory(self._players, board_size)
         self._game_over = False
         self._winner = None
         self._logger = logger or GameLogger()
         self._result_logged = False
+        self._pushed = 0
     
     @property
     def current_player(self):
@@ -46,6 +58,14 @@ class TicTacToeGame:
     def is_draw(self):
         return self._game_over and not self._winner
     
+    @property
+    def history(self):
+        return self._history
+    
+    @property
+    def players(self):
+        return tuple(self._players)
+    
     @property
     def player_names(self):
         return (self._players[0].name, self._players[1].name)
@@ -61,36 +81,145 @@ class TicTacToeGame:
         Returns:
             bool: True if the move was made successfully, False otherwise
         """
+        if self._pushed:
+            raise ValueError("Can't make a move while search moves are pushed")
         if self._game_over:
             return False
         
         if self._board.mark_square(row, col, self.current_player.symbol):
             self._history.add_move(self.current_player, (row, col))
-            
-            # Check for a winner
-            winner_symbol = self._board.get_winner()
-            if winner_symbol:
-                self._game_over = True
-                self._winner = next(player for player in self._players if player.symbol == winner_symbol)
-                self._log_game_result()
-            elif self._board.is_full():
-                self._game_over = True
-                self._log_game_result()
-            else:
-                # Switch to the next player
-                self._current_player_index = (self._current_player_index + 1) % len(self._players)
-            
+            self._update_result()
             return True
         
         return False
     
+    def push(self, cell):
+        """
+        Make a move for a search, to be taken back with pop().
+        
+        The move isn't checked, recorded in the history or logged, and the
+        board isn't copied, so a search can explore a variation in place.
+        Until every pushed move is popped, make_move, undo, redo and
+        to_bytes raise ValueError.
+        
+        Args:
+            cell (int): The index of an empty square, row * size + col
+        """
+        if self._game_over:
+            raise ValueError("Can't push a move after the game is over")
+        player = self._players[self._current_player_index]
+        self._board.push(cell, player.symbol)
+        self._pushed += 1
+        
+        if self._board.get_winner() is not None:
+            self._game_over = True
+            self._winner = player
+        elif self._board.is_full():
+            self._game_over = True
+        else:
+            self._current_player_index = (self._current_player_index + 1) % len(self._players)
+    
+    def pop(self):
+        """
+        Take back the last move made with push().
+        
+        Returns:
+            int: The index of the square that was cleared
+        """
+        if not self._pushed:
+            raise IndexError("No pushed move to pop")
+        self._pushed -= 1
+        if self._game_over:
+            # The turn isn't passed on when a move ends the game
+            self._game_over = False
+            self._winner = None
+        else:
+            self._current_player_index = (self._current_player_index - 1) % len(self._players)
+        return self._board.pop()
+    
+    def _update_result(self):
+        """Check the board for the end of the game after a move, or pass the turn on."""
+        # Check for a winner
+        winner_symbol = self._board.get_winner()
+        if winner_symbol:
+            self._game_over = True
+            self._winner = next(player for player in self._players if player.symbol == winner_symbol)
+            self._log_game_result()
+        elif self._board.is_full():
+            self._game_over = True
+            self._log_game_result()
+        else:
+            # Switch to the next player
+            self._current_player_index = (self._current_player_index + 1) % len(self._players)
+    
+    def undo(self):
+        """
+        Take back the last move.
+        
+        A result that was already logged stays logged, and isn't logged
+        again if the game is played to an end a second time.
+        
+        Returns:
+            bool: True if a move was taken back, False if there were no moves
+        """
+        if self._pushed:
+            raise ValueError("Can't undo a move while search moves are pushed")
+        move = self._history.undo()
+        if move is None:
+            return False
+        
+        player, (row, col) = move
+        self._board.unmark_square(row, col)
+        self._current_player_index = self._players.index(player)
+        self._game_over = False
+        self._winner = None
+        return True
+    
+    def redo(self):
+        """
+        Replay the last move taken back with undo().
+        
+        Returns:
+            bool: True if a move was replayed, False if there was nothing to
+                  redo or its square is taken
+        """
+        if self._pushed:
+            raise ValueError("Can't redo a move while search moves are pushed")
+        move = self._history.redo()
+        if move is None:
+            return False
+        
+        player, (row, col) = move
+        if not self._board.mark_square(row, col, player.symbol):
+            # The square is taken, so put the move back in the redo tail
+            self._history.undo()
+            return False
+        self._update_result()
+        return True
+    
+    def make_computer_move(self):
+        """
+        Let the current player choose and make a move if it's a computer player.
+        
+        Returns:
+            bool: True if a move was made, False otherwise
+        """
+        if self._game_over or not self.current_player.is_computer:
+            return False
+        
+        move = self.current_player.choose_move(self._board)
+        if move is None:
+            return False
+        return self.make_move(*move)
+    
     def _log_game_result(self):
         """Log the game result if the game is over."""
         if not self._result_logged and self._game_over:
             self._logger.log_result(
                 self._players[0], 
                 self._players[1], 
-                self._winner
+                self._winner,
+                history=self._history
             )
             self._result_logged = True
     
@@ -102,6 +231,109 @@ class TicTacToeGame:
         self._game_over = False
         self._winner = None
         self._result_logged = False
+        self._pushed = 0
+    
+    def to_bytes(self):
+        """
+        Encode the state of the game as a compact snapshot.
+        
+        The snapshot holds the board size and win length, the current
+        player, the players' symbols and names, the board with 2 bits per
+        square, and the history including any undone moves. Computer
+        players are stored by name and symbol only.
+        
+        Returns:
+            bytes: The snapshot, to be restored with from_bytes()
+        """
+        if self._pushed:
+            raise ValueError("Can't take a snapshot while moves are pushed")
+        
+        flags = _SNAPSHOT_RESULT_LOGGED if self._result_logged else 0
+        parts = [_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, self._board.size,
+                                       self._board.win_length, self._current_player_index,
+                                       flags)]
+        for player in self._players:
+            for text in (player.symbol, player.name):
+                encoded = text.encode("utf-8")[:255]
+                parts.append(bytes((len(encoded),)))
+                parts.append(encoded)
+        parts.append(self._pack_board())
+        parts.append(self._history.to_bytes())
+        return b"".join(parts)
+    
+    @classmethod
+    def from_bytes(cls, data, logger=None, players=None):
+        """
+        Restore a game from a snapshot made by to_bytes().
+        
+        The board is rebuilt by replaying the history and checked against
+        the stored squares. A result that was logged before the snapshot
+        isn't logged again.
+        
+        Args:
+            data (bytes): The snapshot
+            logger (GameLogger): Where to log the result
+            players (list or None): Players to use instead of plain Players
+                                    with the stored names, such as computer
+                                    players, in the same turn order
+        
+        Returns:
+            TicTacToeGame: The restored game
+        """
+        data = memoryview(data)
+        try:
+            magic, version, size, win_length, current, flags = _SNAPSHOT_HEADER.unpack_from(data)
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise ValueError("Not a game snapshot")
+            
+            offset = _SNAPSHOT_HEADER.size
+            stored = []
+            for _ in range(2):
+                texts = []
+                for _ in range(2):
+                    length = data[offset]
+                    texts.append(str(data[offset + 1:offset + 1 + length], "utf-8"))
+                    offset += 1 + length
+                stored.append(Player(*texts))
+            
+            board_length = (size * size + 3) // 4
+            packed = bytes(data[offset:offset + board_length])
+            offset += board_length
+            
+            game = cls(board_size=size, win_length=win_length, logger=logger,
+                       players=players or stored)
+            game._history = GameHistory.from_bytes(data[offset:], game._players, size)
+        except (IndexError, UnicodeDecodeError, struct.error) as e:
+            raise ValueError(f"Invalid game snapshot: {e}")
+        
+        # Replay the moves without logging them
+        board = game._board
+        for ply, cell in enumerate(game._history.cells):
+            symbol = game._players[ply % len(game._players)].symbol
+            if not board.mark_square(cell // size, cell % size, symbol):
+                raise ValueError("Invalid game snapshot: a move repeats a square")
+        if game._pack_board() != packed:
+            raise ValueError("Invalid game snapshot: the board doesn't match the history")
+        
+        winner_symbol = board.get_winner()
+        if winner_symbol:
+            game._winner = next(player for player in game._players if player.symbol == winner_symbol)
+        game._game_over = winner_symbol is not None or board.is_full()
+        game._current_player_index = current % len(game._players)
+        game._result_logged = bool(flags & _SNAPSHOT_RESULT_LOGGED)
+        return game
+    
+    def _pack_board(self):
+        """Pack the squares 2 bits each, 1 for the first player and 2 for the second."""
+        size = self._board.size
+        packed = 0
+        for value, player in enumerate(self._players[:2], 1):
+            bits = self._board.get_bits(player.symbol)
+            while bits:
+                low = bits & -bits
+                packed |= value << (2 * (low.bit_length() - 1))
+                bits ^= low
+        return packed.to_bytes((size * size + 3) // 4, "little")
     
     def get_game_status(self):
         """Get the current status of the game."""
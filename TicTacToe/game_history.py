@@ -1,30 +1,166 @@
+import struct
+import sys
+from array import array
+
+# Number of moves in the history and in total, including undone moves
+_COUNTS = struct.Struct("<HH")
+
 class GameHistory:
     """
     Keeps track of the game history.
     
+    Each move is stored as one cell index, row * size + col, in a compact
+    array. Players take turns, so the player of a move is implied by its ply
+    and isn't stored with it. Undone moves stay in the array after the end
+    of the history until a new move replaces them, so undo and redo only
+    move a cursor.
+    
+    If the players aren't given, they are learned from the first moves added.
+    
     Attributes:
-        moves (list): A list of moves made in the game
+        moves (list): A list of (player, (row, col)) moves made in the game
     """
-    def __init__(self):
-        self._moves = []
+    __slots__ = ("_players", "_size", "_cells", "_length")
+    
+    def __init__(self, players=None, size=3):
+        self._players = list(players) if players else []
+        self._size = size
+        self._cells = array("H")
+        self._length = 0
     
     def add_move(self, player, position):
         """
-        Add a move to the history.
+        Add a move to the history, discarding any moves that were undone.
         
         Args:
             player (Player): The player who made the move
             position (tuple): The position (row, col) where the move was made
+        
+        Raises:
+            ValueError: If the position is off a board of the history's size
+        """
+        row, col = position
+        if not (0 <= row < self._size and 0 <= col < self._size):
+            raise ValueError(f"position {position} is off a {self._size}x{self._size} board")
+        if len(self._players) <= self._length and player not in self._players:
+            self._players.append(player)
+        if self._length < len(self._cells):
+            del self._cells[self._length:]
+        self._cells.append(row * self._size + col)
+        self._length += 1
+    
+    def undo(self):
+        """
+        Step back over the last move.
+        
+        Returns:
+            tuple or None: The (player, (row, col)) move that was undone, or None
+                           if there are no moves
         """
-        self._moves.append((player, position))
+        if self._length == 0:
+            return None
+        self._length -= 1
+        return self._move(self._length)
+    
+    def redo(self):
+        """
+        Step forward over the last undone move.
+        
+        Returns:
+            tuple or None: The (player, (row, col)) move that was redone, or None
+                           if there's nothing to redo
+        """
+        if self._length == len(self._cells):
+            return None
+        self._length += 1
+        return self._move(self._length - 1)
+    
+    @property
+    def can_undo(self):
+        return self._length > 0
+    
+    @property
+    def can_redo(self):
+        return self._length < len(self._cells)
+    
+    @property
+    def cells(self):
+        """The cell indices of the moves, as a compact array('H')."""
+        return self._cells[:self._length]
+    
+    @property
+    def last_move(self):
+        """The (player, (row, col)) of the last move, or None if there are no moves."""
+        return self._move(self._length - 1) if self._length else None
     
     def get_moves(self):
         """Get all moves in the history."""
-        return self._moves.copy()
+        return [self._move(ply) for ply in range(self._length)]
+    
+    def copy(self):
+        """Create an independent copy of the history."""
+        history = GameHistory(self._players, self._size)
+        history._cells = array("H", self._cells)
+        history._length = self._length
+        return history
     
     def clear(self):
         """Clear the history."""
-        self._moves = []
+        del self._cells[:]
+        self._length = 0
+    
+    def to_bytes(self):
+        """
+        Encode the moves, including any that were undone, as bytes.
+        
+        Returns:
+            bytes: The number of moves in the history and in total, then
+                   each move's cell index, all as little-endian 16-bit integers
+        """
+        cells = self._cells
+        if sys.byteorder != "little":
+            cells = array("H", cells)
+            cells.byteswap()
+        return _COUNTS.pack(self._length, len(self._cells)) + cells.tobytes()
+    
+    @classmethod
+    def from_bytes(cls, data, players=None, size=3):
+        """
+        Decode a history encoded by to_bytes().
+        
+        Args:
+            data (bytes): The encoded history
+            players (list or None): The players in turn order
+            size (int): The size of the board
+        
+        Returns:
+            GameHistory: The decoded history
+        """
+        length, total = _COUNTS.unpack_from(data)
+        if length > total or len(data) != _COUNTS.size + 2 * total:
+            raise ValueError("Invalid game history data")
+        history = cls(players, size)
+        history._cells.frombytes(data[_COUNTS.size:])
+        if sys.byteorder != "little":
+            history._cells.byteswap()
+        if any(cell >= size * size for cell in history._cells):
+            raise ValueError("Invalid game history data")
+        history._length = length
+        return history
+    
+    def _move(self, ply):
+        """Decode the move made at a ply."""
+        player = self._players[ply % len(self._players)] if self._players else None
+        return player, divmod(self._cells[ply], self._size)
+    
+    def __iter__(self):
+        for ply in range(self._length):
+            yield self._move(ply)
+    
+    def __getitem__(self, ply):
+        if not -self._length <= ply < self._length:
+            raise IndexError("move index out of range")
+        return self._move(ply % self._length)
     
     def __len__(self):
-        return len(self._moves)
\ No newline at end of file
+        return self._length
\ No newline at end of file
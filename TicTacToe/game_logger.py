@@ -1,13 +1,126 @@
+import atexit
+import gzip
+import os
+import queue
+import re
+import shutil
+import threading
+import time
 from datetime import datetime
 
+# Closed segments of a rotated log are named <log file>.<number>, with .gz
+# added once compressed; higher numbers are newer
+_SEGMENT_SUFFIX = re.compile(r"\.(\d+)(\.gz)?")
+
+def log_segments(log_file):
+    """
+    Get the files a log is made of, oldest first.
+    
+    Args:
+        log_file (str): The path of the log
+    
+    Returns:
+        list: (number, path) pairs for the closed segments, followed by
+              (None, log_file) for the file being written if it exists
+    """
+    directory = os.path.dirname(log_file) or "."
+    prefix = os.path.basename(log_file)
+    segments = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        match = _SEGMENT_SUFFIX.fullmatch(name[len(prefix):]) if name.startswith(prefix) else None
+        if match:
+            number = int(match.group(1))
+            # A segment left uncompressed by an interrupted rotation wins
+            # over its compressed copy
+            if number not in segments or not match.group(2):
+                segments[number] = os.path.join(os.path.dirname(log_file), name)
+    
+    result = sorted(segments.items())
+    if os.path.exists(log_file):
+        result.append((None, log_file))
+    return result
+
+def open_log_segment(path):
+    """Open a log segment for reading as text, decompressing it if it's compressed."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+def read_log_lines(log_file):
+    """
+    Read every line of a log, through all of its segments in order.
+    
+    Lines are read one at a time, so memory use doesn't grow with the size
+    of the log.
+    
+    Args:
+        log_file (str): The path of the log
+    
+    Yields:
+        str: Each line, without its line ending
+    """
+    for _, path in log_segments(log_file):
+        try:
+            with open_log_segment(path) as f:
+                for line in f:
+                    yield line.rstrip("\r\n")
+        except FileNotFoundError:
+            # Rotated away while the log was being read
+            continue
+
 class GameLogger:
     """
     Handles logging of game results to a file.
+    
+    Listeners added with add_listener are called with the same arguments as
+    log_result for every result once it has been written, so other records
+    such as running stats can be kept up to date without reading the log
+    back. A listener that raises doesn't stop the result being logged or
+    the other listeners being called.
+    
+    With max_bytes or max_age set, the log is rotated before a write that
+    would take it past max_bytes, or once its first line is max_age seconds
+    old. The file is renamed to the next numbered segment and, if compress
+    is set, gzipped; read_log_lines reads all segments back in order.
     """
-    def __init__(self, log_file="game_log.txt"):
+    def __init__(self, log_file="game_log.txt", max_bytes=None, max_age=None, compress=True):
         self._log_file = log_file
+        self._listeners = []
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._compress = compress
+        self._segment_start = None
     
-    def log_result(self, player1, player2, winner=None):
+    @property
+    def log_file(self):
+        return self._log_file
+    
+    def add_listener(self, listener):
+        """
+        Call a function with every logged result.
+        
+        Args:
+            listener (callable): Called as listener(player1, player2, winner, history)
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        """Stop calling a function added with add_listener."""
+        self._listeners.remove(listener)
+    
+    def _notify(self, player1, player2, winner, history):
+        """Pass a result to the listeners, reporting any errors they raise."""
+        for listener in list(self._listeners):
+            try:
+                listener(player1, player2, winner, history)
+            except Exception as e:
+                print(f"Error in log listener: {e}")
+    
+    def log_result(self, player1, player2, winner=None, history=None):
         """
         Log the result of a game.
         
@@ -15,19 +128,208 @@ class GameLogger:
             player1 (Player): The first player
             player2 (Player): The second player
             winner (Player or None): The winning player, or None if it's a draw
+            history (GameHistory or None): The game's moves (not part of the text log)
         """
+        message = self._format_result(player1, player2, winner)
+        
+        try:
+            self._rotate_if_needed(len(message) + 1)
+            with open(self._log_file, "a") as f:
+                f.write(message + "\n")
+            written = True
+        except Exception as e:
+            print(f"Error writing to log file: {e}")
+            written = False
+        self._notify(player1, player2, winner, history)
+        return written
+    
+    def _format_result(self, player1, player2, winner):
+        """Format a game result as a timestamped log line."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         if winner:
             loser = player2 if winner.name == player1.name else player1
-            message = f"[{timestamp}] {winner.name} won against {loser.name}"
-        else:
-            message = f"[{timestamp}] {player1.name} and {player2.name} draw"
+            return f"[{timestamp}] {winner.name} won against {loser.name}"
+        return f"[{timestamp}] {player1.name} and {player2.name} draw"
+    
+    def _rotate_if_needed(self, incoming):
+        """Rotate the log if writing incoming more bytes would pass a rotation limit."""
+        if self._max_bytes is None and self._max_age is None:
+            return
+        try:
+            size = os.path.getsize(self._log_file)
+        except OSError:
+            return
+        if not size:
+            return
+        if self._max_bytes is not None and size + incoming > self._max_bytes:
+            self.rotate()
+        elif self._max_age is not None and time.time() - self._segment_started() >= self._max_age:
+            self.rotate()
+    
+    def _segment_started(self):
+        """Get when the first line of the log file was written, as a Unix time."""
+        if self._segment_start is None:
+            try:
+                with open(self._log_file) as f:
+                    first = f.readline()
+                self._segment_start = datetime.strptime(first[1:20], "%Y-%m-%d %H:%M:%S").timestamp()
+            except (OSError, ValueError):
+                self._segment_start = os.path.getmtime(self._log_file)
+        return self._segment_start
+    
+    def rotate(self):
+        """
+        Close the current log file as a numbered segment and start a new one.
         
+        Returns:
+            str or None: The path of the closed segment, or None if there was
+                         nothing to rotate or it couldn't be rotated
+        """
         try:
+            if not os.path.getsize(self._log_file):
+                return None
+        except OSError:
+            return None
+        
+        segments = log_segments(self._log_file)
+        number = max([number for number, _ in segments if number is not None], default=0) + 1
+        segment = f"{self._log_file}.{number:06d}"
+        try:
+            os.replace(self._log_file, segment)
+            self._segment_start = None
+            if self._compress:
+                # Compress to a temporary name so a crash never leaves a
+                # truncated .gz behind
+                with open(segment, "rb") as src, gzip.open(segment + ".gz.tmp", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(segment + ".gz.tmp", segment + ".gz")
+                os.remove(segment)
+                segment += ".gz"
+            return segment
+        except Exception as e:
+            print(f"Error rotating log file: {e}")
+            return None
+
+class BufferedGameLogger(GameLogger):
+    """
+    Logs game results from a background thread in batches.
+    
+    log_result only formats the line and queues it, so it never waits for
+    the disk. A writer thread appends queued lines with one write per batch,
+    either when flush_size lines are waiting or when the oldest waiting line
+    is flush_interval seconds old. Anything still queued is written when the
+    logger is closed, including at interpreter exit. Rotation, compression
+    and listeners also run on the writer thread, after each batch is
+    written; listeners are given a copy of the game's history, since the
+    game may have moved on by then.
+    """
+    _STOP = object()
+    
+    def __init__(self, log_file="game_log.txt", flush_size=100, flush_interval=1.0,
+                 max_bytes=None, max_age=None, compress=True):
+        super().__init__(log_file, max_bytes, max_age, compress)
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BufferedGameLogger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def log_result(self, player1, player2, winner=None, history=None):
+        """
+        Queue the result of a game to be written.
+        
+        Args:
+            player1 (Player): The first player
+            player2 (Player): The second player
+            winner (Player or None): The winning player, or None if it's a draw
+            history (GameHistory or None): The game's moves (not part of the text log)
+        
+        Returns:
+            bool: True if the result was queued, False if the logger is closed
+        """
+        if self._closed:
+            return False
+        result = None
+        if self._listeners:
+            if history is not None:
+                history = history.copy()
+            result = (player1, player2, winner, history)
+        self._queue.put((self._format_result(player1, player2, winner), result))
+        return True
+    
+    def flush(self):
+        """Wait until every result queued so far has been written and passed to the listeners."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write any queued results and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _run(self):
+        """Collect queued lines and write them in batches."""
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if not pending else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # The oldest pending line has waited flush_interval seconds
+                self._write(pending)
+                continue
+            
+            if item is self._STOP:
+                self._write(pending)
+                return
+            if isinstance(item, threading.Event):
+                self._write(pending)
+                item.set()
+                continue
+            
+            pending.append(item)
+            if len(pending) == 1:
+                deadline = time.monotonic() + self._flush_interval
+            if len(pending) >= self._flush_size:
+                self._write(pending)
+    
+    def _write(self, items):
+        """Append the queued lines with a single write, then pass their results to the listeners."""
+        if not items:
+            return
+        data = "\n".join(line for line, _ in items) + "\n"
+        try:
+            self._rotate_if_needed(len(data))
             with open(self._log_file, "a") as f:
-                f.write(message + "\n")
-            return True
+                f.write(data)
         except Exception as e:
             print(f"Error writing to log file: {e}")
-            return False
\ No newline at end of file
+        for _, result in items:
+            if result is not None:
+                self._notify(*result)
+        items.clear()
+
+class NullLogger:
+    """
+    A logger that discards game results, for headless and simulated games.
+    """
+    def log_result(self, player1, player2, winner=None, history=None):
+        """Accept a game result without recording it."""
+        return True
\ No newline at end of file
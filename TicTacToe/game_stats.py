@@ -0,0 +1,304 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from game_logger import read_log_lines
+
+_HOUR_FORMAT = "%Y-%m-%d %H"
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Lines written by GameLogger._format_result
+_WON_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] (?P<winner>.+) won against (?P<loser>.+)$")
+_DRAW_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] (?P<player1>.+) and (?P<player2>.+) draw$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    streak INTEGER NOT NULL DEFAULT 0,
+    best_streak INTEGER NOT NULL DEFAULT 0,
+    last_played TEXT
+);
+CREATE TABLE IF NOT EXISTS head_to_head (
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    draws INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player, opponent)
+);
+CREATE TABLE IF NOT EXISTS hourly (
+    hour TEXT PRIMARY KEY,
+    games INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    games INTEGER NOT NULL DEFAULT 0,
+    first_game TEXT,
+    last_game TEXT
+);
+INSERT OR IGNORE INTO totals (id) VALUES (0);
+"""
+
+# Column updates for a player's row and head-to-head row after a win, a
+# loss and a draw. A streak counts wins in a row when positive and losses
+# in a row when negative; a draw ends it.
+_PLAYER_UPDATES = {
+    "win": "wins = wins + 1, streak = CASE WHEN streak > 0 THEN streak + 1 ELSE 1 END, "
+           "best_streak = MAX(best_streak, CASE WHEN streak > 0 THEN streak + 1 ELSE 1 END)",
+    "loss": "losses = losses + 1, streak = CASE WHEN streak < 0 THEN streak - 1 ELSE -1 END",
+    "draw": "draws = draws + 1, streak = 0"
+}
+_HEAD_TO_HEAD_UPDATES = {
+    "win": "wins = wins + 1",
+    "loss": "losses = losses + 1",
+    "draw": "draws = draws + 1"
+}
+
+class GameStats:
+    """
+    Running per-player statistics of logged games, kept in a SQLite file.
+    
+    Each result updates a handful of rows in one transaction: the two
+    players' win/loss/draw counts and streaks, their head-to-head record
+    and the game count of the hour it was played in. Reading the stats
+    never touches the game log, so it takes the same time however many
+    games have been played.
+    
+    log_result has the signature of a logger's, so the stats can be kept
+    up to date with GameLogger.add_listener(stats.log_result) or used as
+    the logger= argument of TicTacToeGame directly. import_log builds the
+    stats from an existing text log. The stats can be updated from one
+    thread, such as a buffered logger's writer, while they are read from
+    another.
+    """
+    def __init__(self, path="game_stats.db"):
+        self._path = path
+        self._created = not os.path.exists(path)
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        # Results are small and frequent, so commits skip waiting for a full sync
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+    
+    @property
+    def path(self):
+        return self._path
+    
+    @property
+    def created(self):
+        """Whether the stats file was created when these stats were opened."""
+        return self._created
+    
+    @property
+    def total_games(self):
+        return self._totals()["games"]
+    
+    def log_result(self, player1, player2, winner=None, history=None):
+        """
+        Add the result of a game to the stats.
+        
+        Args:
+            player1 (Player): The first player
+            player2 (Player): The second player
+            winner (Player or None): The winning player, or None if it's a draw
+            history (GameHistory or None): The game's moves (not used)
+        
+        Returns:
+            bool: True if the stats were updated, False otherwise
+        """
+        return self.record(player1.name, player2.name, winner.name if winner else None)
+    
+    def record(self, player1, player2, winner=None, timestamp=None):
+        """
+        Add the result of a game between two named players to the stats.
+        
+        Args:
+            player1 (str): The name of the first player
+            player2 (str): The name of the second player
+            winner (str or None): The name of the winner, or None if it's a draw
+            timestamp (datetime or None): When the game ended (defaults to now)
+        
+        Returns:
+            bool: True if the stats were updated, False otherwise
+        """
+        try:
+            with self._lock, self._connection:
+                self._record(player1, player2, winner, timestamp or datetime.now())
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating game stats: {e}")
+            return False
+    
+    def _record(self, player1, player2, winner, timestamp):
+        """Update the stats for one game inside the current transaction."""
+        if winner is None:
+            outcomes = ((player1, player2, "draw"), (player2, player1, "draw"))
+        else:
+            loser = player2 if winner == player1 else player1
+            outcomes = ((winner, loser, "win"), (loser, winner, "loss"))
+        
+        played = timestamp.strftime(_TIMESTAMP_FORMAT)
+        execute = self._connection.execute
+        for player, opponent, outcome in outcomes:
+            execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (player,))
+            execute(f"UPDATE players SET {_PLAYER_UPDATES[outcome]}, last_played = ? WHERE name = ?",
+                    (played, player))
+            execute("INSERT OR IGNORE INTO head_to_head (player, opponent) VALUES (?, ?)",
+                    (player, opponent))
+            execute(f"UPDATE head_to_head SET {_HEAD_TO_HEAD_UPDATES[outcome]} "
+                    "WHERE player = ? AND opponent = ?", (player, opponent))
+        
+        execute("INSERT INTO hourly (hour, games) VALUES (?, 1) "
+                "ON CONFLICT (hour) DO UPDATE SET games = games + 1",
+                (timestamp.strftime(_HOUR_FORMAT),))
+        execute("UPDATE totals SET games = games + 1, "
+                "first_game = MIN(COALESCE(first_game, ?), ?), "
+                "last_game = MAX(COALESCE(last_game, ?), ?) WHERE id = 0",
+                (played, played, played, played))
+    
+    def import_log(self, log_file):
+        """
+        Add every result in a text game log to the stats.
+        
+        Lines that aren't results are skipped. Every segment of a rotated log
+        is read, one line at a time. The whole log is added in one
+        transaction, so an import that fails adds nothing.
+        
+        Args:
+            log_file (str): The path of a log written by GameLogger
+        
+        Returns:
+            int: The number of results added, or -1 if the log couldn't be read
+        """
+        count = 0
+        try:
+            with self._lock, self._connection:
+                for line in read_log_lines(log_file):
+                    match = _WON_LINE.match(line)
+                    if match:
+                        players = (match["winner"], match["loser"])
+                        winner = match["winner"]
+                    else:
+                        match = _DRAW_LINE.match(line)
+                        if not match:
+                            continue
+                        players = (match["player1"], match["player2"])
+                        winner = None
+                    try:
+                        timestamp = datetime.strptime(match["timestamp"], _TIMESTAMP_FORMAT)
+                    except ValueError:
+                        continue
+                    self._record(players[0], players[1], winner, timestamp)
+                    count += 1
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error importing game log: {e}")
+            return -1
+        return count
+    
+    def player(self, name):
+        """
+        Get the stats of one player.
+        
+        Returns:
+            dict or None: The player's 'name', 'wins', 'losses', 'draws',
+                          'streak', 'best_streak' and 'last_played', or None
+                          if they haven't played
+        """
+        rows = self._query("SELECT * FROM players WHERE name = ?", (name,))
+        return dict(rows[0]) if rows else None
+    
+    def players(self, limit=None):
+        """
+        Get the stats of the players with the most wins.
+        
+        Args:
+            limit (int or None): The most players to return (defaults to all)
+        
+        Returns:
+            list: A dict per player, as from player()
+        """
+        rows = self._query(
+            "SELECT * FROM players ORDER BY wins DESC, losses ASC, name ASC LIMIT ?",
+            (-1 if limit is None else limit,))
+        return [dict(row) for row in rows]
+    
+    def head_to_head(self, name, limit=None):
+        """
+        Get a player's record against each opponent, most played first.
+        
+        Returns:
+            list: A dict per opponent with 'opponent', 'wins', 'losses' and
+                  'draws', counted from name's point of view
+        """
+        rows = self._query(
+            "SELECT opponent, wins, losses, draws FROM head_to_head WHERE player = ? "
+            "ORDER BY wins + losses + draws DESC, opponent ASC LIMIT ?",
+            (name, -1 if limit is None else limit))
+        return [dict(row) for row in rows]
+    
+    def games_per_hour(self, hours=24, now=None):
+        """
+        Get the number of games played in each of the last few hours.
+        
+        Args:
+            hours (int): The number of hours, including the current one
+            now (datetime or None): The current time (defaults to now)
+        
+        Returns:
+            list: (hour, games) pairs from the oldest hour to the current one,
+                  where hour is a datetime at the start of the hour
+        """
+        current = (now or datetime.now()).replace(minute=0, second=0, microsecond=0)
+        first = current - timedelta(hours=hours - 1)
+        rows = self._query(
+            "SELECT hour, games FROM hourly WHERE hour >= ? AND hour <= ?",
+            (first.strftime(_HOUR_FORMAT), current.strftime(_HOUR_FORMAT)))
+        games = {hour: count for hour, count in rows}
+        return [(hour, games.get(hour.strftime(_HOUR_FORMAT), 0))
+                for hour in (first + timedelta(hours=i) for i in range(hours))]
+    
+    def average_games_per_hour(self):
+        """Get the average number of games per hour from the first game to the last."""
+        totals = self._totals()
+        if not totals["games"]:
+            return 0.0
+        first = datetime.strptime(totals["first_game"], _TIMESTAMP_FORMAT)
+        last = datetime.strptime(totals["last_game"], _TIMESTAMP_FORMAT)
+        # Games within a single hour count as that hour's rate
+        return totals["games"] / max(1.0, (last - first).total_seconds() / 3600)
+    
+    def _totals(self):
+        return self._query("SELECT * FROM totals WHERE id = 0")[0]
+    
+    def _query(self, sql, parameters=()):
+        """Run a query and fetch all of its rows."""
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+    
+    def clear(self):
+        """Forget every recorded result."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM players")
+            self._connection.execute("DELETE FROM head_to_head")
+            self._connection.execute("DELETE FROM hourly")
+            self._connection.execute(
+                "UPDATE totals SET games = 0, first_game = NULL, last_game = NULL WHERE id = 0")
+    
+    def close(self):
+        """Close the stats file."""
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
\ No newline at end of file
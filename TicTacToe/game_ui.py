@@ -1,10 +1,18 @@
-import pygame
 import os
+import pygame
 import sys
+import time
 
+from computer_player import ComputerPlayer
+from fonts import DEFAULT_FONT_CACHE_FILE, FontCache
 from game import TicTacToeGame
-from game_logger import GameLogger
-from ui_components import Button, TextInput
+from game_logger import BufferedGameLogger
+from game_stats import GameStats
+from instrumentation import default_targets, method_targets, profiler
+from log_index import LogLineIndex
+from player import Player
+from render_cache import render_text, text_cache
+from ui_components import Button, TextInput, get_ticks
 
 class GameUI:
     """
@@ -16,6 +24,7 @@ class GameUI:
     OPTIONS = 2
     GAME = 3
     VIEW_LOG = 4  # New state for viewing the log
+    VIEW_STATS = 5
     
     # Colors
     BLACK = (0, 0, 0)
@@ -25,6 +34,25 @@ class GameUI:
     BLUE = (0, 100, 255)
     GREEN = (0, 200, 0)
     
+    # Events after which the whole screen is redrawn
+    REDRAW_EVENTS = (
+        pygame.MOUSEBUTTONDOWN,
+        pygame.MOUSEWHEEL,
+        pygame.KEYDOWN,
+        pygame.VIDEOEXPOSE,
+        pygame.WINDOWEXPOSED,
+        pygame.WINDOWRESTORED
+    )
+    
+    # How often the debug overlay is redrawn (ms)
+    OVERLAY_REFRESH_INTERVAL = 250
+    
+    # How often the log view checks the log file for new results (ms)
+    LOG_REFRESH_INTERVAL = 500
+    
+    # Size at which the log is rotated into a compressed segment (bytes)
+    LOG_SEGMENT_SIZE = 1024 * 1024
+    
     # Available resolutions
     RESOLUTIONS = [
         (640, 480),
@@ -33,9 +61,12 @@ class GameUI:
         (1280, 720)
     ]
     
-    def __init__(self, log_file="game_log.txt"):
-        # Initialize Pygame
-        pygame.init()
+    def __init__(self, log_file="game_log.txt", instrument=False,
+                 font_cache_file=DEFAULT_FONT_CACHE_FILE, stats_file=None):
+        # Initialize only the parts of Pygame the game uses, which skips
+        # starting up audio
+        pygame.display.init()
+        pygame.font.init()
         
         # Default resolution
         self._resolution_index = 1  # 800x600 by default
@@ -45,12 +76,14 @@ class GameUI:
         self._screen = pygame.display.set_mode((self._width, self._height))
         pygame.display.set_caption("Tic-Tac-Toe")
         
-        # Set up fonts
-        self._title_font = pygame.font.SysFont("Arial", 48, bold=True)
-        self._menu_font = pygame.font.SysFont("Arial", 32)
-        self._button_font = pygame.font.SysFont("Arial", 24)
-        self._game_font = pygame.font.SysFont("Arial", 24)
-        self._log_font = pygame.font.SysFont("Courier New", 16)
+        # Set up fonts, from the files found on an earlier run if possible
+        fonts = FontCache(font_cache_file)
+        self._title_font = fonts.get_font("Arial", 48, bold=True)
+        self._menu_font = fonts.get_font("Arial", 32)
+        self._button_font = fonts.get_font("Arial", 24)
+        self._game_font = fonts.get_font("Arial", 24)
+        self._log_font = fonts.get_font("Courier New", 16)
+        fonts.save()
         
         # Game state
         self._state = self.MAIN_MENU
@@ -60,12 +93,38 @@ class GameUI:
         # Player names
         self._player1_name = "Player X"
         self._player2_name = "Player O"
+        self._vs_computer = False
         
         # Logger
         self._log_file = log_file
-        self._logger = GameLogger(log_file)
-        self._log_entries = []
+        self._logger = BufferedGameLogger(log_file, max_bytes=self.LOG_SEGMENT_SIZE)
+        self._log_index = LogLineIndex(log_file)
         self._log_scroll_pos = 0
+        self._log_line_cache = {}
+        self._log_refresh_time = 0
+        self._log_error = None
+        
+        # Player stats, kept next to the log and updated as results are logged
+        if stats_file is None:
+            stats_file = os.path.splitext(log_file)[0] + "_stats.db"
+        self._stats = GameStats(stats_file)
+        if self._stats.created:
+            self._stats.import_log(log_file)
+        self._logger.add_listener(self._stats.log_result)
+        self._stats_players = []
+        self._stats_selected = None
+        self._stats_head_to_head = []
+        self._stats_summary = ""
+        
+        # Screen regions waiting to be redrawn
+        self._full_redraw = True
+        self._dirty_rects = []
+        
+        # Instrumentation runs while it's requested or the F3 overlay is shown
+        self._instrument = instrument
+        self._show_overlay = False
+        self._overlay_refresh_time = 0
+        self._update_instrumentation()
         
         # Clock for controlling frame rate
         self._clock = pygame.time.Clock()
@@ -104,6 +163,8 @@ class GameUI:
             Button(button_x, self._height // 2, button_width, button_height, 
                    "View Game Log", self._button_font, self.VIEW_LOG),
             Button(button_x, self._height // 2 + 60, button_width, button_height, 
+                   "Statistics", self._button_font, self.VIEW_STATS),
+            Button(button_x, self._height // 2 + 120, button_width, button_height,
                    "Exit Game", self._button_font, "exit")
         ])
         
@@ -123,6 +184,11 @@ class GameUI:
                                          input_width, input_height, 
                                          "Start Game", self._button_font, self.GAME)
         
+        self._computer_button = Button(input_x, self._height // 2 + 120,
+                                       input_width, input_height,
+                                       self._computer_button_text(), self._button_font,
+                                       "toggle_computer")
+        
         # Back button for name input and options screens
         self._back_button = Button(20, self._height - 70, 100, 40, 
                                    "Back", self._button_font, self.MAIN_MENU)
@@ -136,13 +202,24 @@ class GameUI:
             self._resolution_buttons.append(btn)
         
         # Log view elements
+        self._log_area = pygame.Rect(50, 100, self._width - 120, self._height - 200)
+        self._log_visible_lines = (self._log_area.height - 20) // 20
         self._log_scroll_up = Button(self._width - 60, 100, 40, 40, "↑", self._button_font, "scroll_up")
         self._log_scroll_down = Button(self._width - 60, self._height - 100, 40, 40, "↓", self._button_font, "scroll_down")
         
+        # Stats view elements: the players table over the selected player's
+        # head-to-head records
+        self._stats_area = pygame.Rect(50, 130, self._width - 100, self._height - 220)
+        self._stats_rows = max(1, ((self._stats_area.height - 20) // 20 - 3) // 2)
+        
         # Game elements
         if self._game:
             self._setup_game_elements()
     
+    def _computer_button_text(self):
+        """Get the label of the button that picks who plays O."""
+        return "Player 2: Computer" if self._vs_computer else "Player 2: Human"
+    
     def _setup_game_elements(self):
         """Set up game-specific UI elements."""
         # Calculate board dimensions
@@ -158,6 +235,62 @@ class GameUI:
             self._board_y + self._board_size_px + 30, 
             120, 40, "Reset Game", self._button_font, "reset"
         )
+        
+        # Board artwork only changes with the cell size
+        self._board_surface = self._render_board()
+        self._mark_sprites = {
+            (symbol, winning): self._render_mark(symbol, winning)
+            for symbol in ('X', 'O')
+            for winning in (False, True)
+        }
+    
+    def _render_board(self):
+        """
+        Render the empty board with its grid lines.
+        
+        Returns:
+            pygame.Surface: The board, one pixel larger than the board on each side
+                            so the thick border fits
+        """
+        size = int(self._board_size_px) + 2
+        surface = pygame.Surface((size, size))
+        surface.fill(self.BLACK)
+        for i in range(self._board_size + 1):
+            offset = 1 + i * self._cell_size
+            width = 2 if i == 0 or i == self._board_size else 1
+            # Vertical and horizontal lines
+            pygame.draw.line(surface, self.WHITE, (offset, 1), (offset, 1 + self._board_size_px), width)
+            pygame.draw.line(surface, self.WHITE, (1, offset), (1 + self._board_size_px, offset), width)
+        return surface
+    
+    def _render_mark(self, symbol, winning):
+        """
+        Render an X or O the size of one cell.
+        
+        Args:
+            symbol (str): 'X' or 'O'
+            winning (bool): Whether to use the color of a winning mark
+        
+        Returns:
+            pygame.Surface: The mark on a transparent cell-sized surface
+        """
+        cell = int(self._cell_size) + 1
+        surface = pygame.Surface((cell, cell), pygame.SRCALPHA)
+        center = self._cell_size / 2
+        thickness = int(self._cell_size * 0.1)
+        
+        if symbol == 'X':
+            color = self.GREEN if winning else self.RED
+            size = self._cell_size * 0.3
+            pygame.draw.line(surface, color, (center - size, center - size),
+                             (center + size, center + size), thickness)
+            pygame.draw.line(surface, color, (center + size, center - size),
+                             (center - size, center + size), thickness)
+        else:
+            color = self.GREEN if winning else self.BLUE
+            pygame.draw.circle(surface, color, (int(center), int(center)),
+                               int(self._cell_size * 0.3), thickness)
+        return surface
     
     def _change_resolution(self, index):
         """Change the game resolution."""
@@ -165,7 +298,11 @@ class GameUI:
             self._resolution_index = index
             self._width, self._height = self.RESOLUTIONS[index]
             self._screen = pygame.display.set_mode((self._width, self._height))
+            
+            # Nothing rendered for the old layout is worth keeping
+            text_cache.clear()
             self._create_ui_elements()
+            self._invalidate()
     
     def _get_cell_from_pos(self, pos):
         """Convert screen position to board cell."""
@@ -184,61 +321,78 @@ class GameUI:
         
         return None
     
-    def _load_log_entries(self):
-        """Load log entries from the log file."""
-        self._log_entries = []
+    def _refresh_log(self):
+        """
+        Index any lines appended to the log file since the last refresh.
+        
+        Returns:
+            bool: True if the log view needs redrawing
+        """
+        # Make sure results still queued in the logger are on disk
+        self._logger.flush()
+        
+        line_count = len(self._log_index)
+        error = self._log_error
+        following = self._log_scroll_pos >= self._max_log_scroll()
         try:
-            if os.path.exists(self._log_file):
-                with open(self._log_file, "r") as f:
-                    self._log_entries = f.readlines()
+            self._log_index.refresh()
+            self._log_error = None
         except Exception as e:
             print(f"Error reading log file: {e}")
-            self._log_entries = [f"Error reading log file: {e}"]
+            self._log_error = f"Error reading log file: {e}"
+        
+        # The file was replaced, so cached lines no longer match
+        if len(self._log_index) < line_count:
+            self._log_line_cache = {}
+        
+        # Keep showing the newest results if the view was at the end
+        if following:
+            self._log_scroll_pos = self._max_log_scroll()
+        self._log_refresh_time = get_ticks()
+        return len(self._log_index) != line_count or self._log_error != error
+    
+    def _refresh_stats(self):
+        """Read the players table and the selected player's records from the stats."""
+        # Make sure results still queued in the logger have reached the stats
+        self._logger.flush()
+        self._stats_players = self._stats.players(limit=self._stats_rows)
+        names = [player["name"] for player in self._stats_players]
+        if self._stats_selected not in names:
+            self._stats_selected = names[0] if names else None
+        self._stats_head_to_head = []
+        if self._stats_selected is not None:
+            self._stats_head_to_head = self._stats.head_to_head(self._stats_selected,
+                                                                limit=self._stats_rows)
+        
+        last_day = sum(games for _, games in self._stats.games_per_hour(24))
+        self._stats_summary = (f"{self._stats.total_games} games, {last_day} in the last 24h, "
+                               f"{self._stats.average_games_per_hour():.1f} per hour")
+    
+    def _stats_row_at(self, pos):
+        """Get the index of the players table row at a screen position, or None."""
+        area = self._stats_area
+        index = (pos[1] - area.y - 30) // 20
+        if area.collidepoint(pos) and 0 <= index < len(self._stats_players):
+            return index
+        return None
+    
+    def _max_log_scroll(self):
+        """Get the highest scroll position that still fills the log view."""
+        return max(0, len(self._log_index) - self._log_visible_lines)
     
     def _draw_x(self, row, col, winning=False):
         """Draw an X symbol in the specified cell."""
-        x = self._board_x + col * self._cell_size + self._cell_size / 2
-        y = self._board_y + row * self._cell_size + self._cell_size / 2
-        
-        size = self._cell_size * 0.3
-        thickness = int(self._cell_size * 0.1)
-        
-        color = self.GREEN if winning else self.RED
-        
-        # Draw the X with lines
-        pygame.draw.line(
-            self._screen, 
-            color,
-            (x - size, y - size),
-            (x + size, y + size),
-            thickness
-        )
-        pygame.draw.line(
-            self._screen, 
-            color,
-            (x + size, y - size),
-            (x - size, y + size),
-            thickness
-        )
+        self._draw_mark('X', row, col, winning)
     
     def _draw_o(self, row, col, winning=False):
         """Draw an O symbol in the specified cell."""
-        x = self._board_x + col * self._cell_size + self._cell_size / 2
-        y = self._board_y + row * self._cell_size + self._cell_size / 2
-        
-        radius = int(self._cell_size * 0.3)
-        thickness = int(self._cell_size * 0.1)
-        
-        color = self.GREEN if winning else self.BLUE
-        
-        # Draw the O with a circle
-        pygame.draw.circle(
-            self._screen,
-            color,
-            (int(x), int(y)),
-            radius,
-            thickness
-        )
+        self._draw_mark('O', row, col, winning)
+    
+    def _draw_mark(self, symbol, row, col, winning):
+        """Blit the pre-rendered sprite of a mark into the specified cell."""
+        x = self._board_x + col * self._cell_size
+        y = self._board_y + row * self._cell_size
+        self._screen.blit(self._mark_sprites[(symbol, bool(winning))], (int(x), int(y)))
     
     def _draw_main_menu(self):
         """Draw the main menu."""
@@ -246,7 +400,7 @@ class GameUI:
         self._screen.fill(self.BLACK)
         
         # Draw title
-        title = self._title_font.render("Tic-Tac-Toe", True, self.WHITE)
+        title = render_text(self._title_font, "Tic-Tac-Toe", self.WHITE)
         title_rect = title.get_rect(center=(self._width // 2, 100))
         self._screen.blit(title, title_rect)
         
@@ -260,16 +414,16 @@ class GameUI:
         self._screen.fill(self.BLACK)
         
         # Draw title
-        title = self._title_font.render("Enter Player Names", True, self.WHITE)
+        title = render_text(self._title_font, "Enter Player Names", self.WHITE)
         title_rect = title.get_rect(center=(self._width // 2, 100))
         self._screen.blit(title, title_rect)
         
         # Draw labels
-        p1_label = self._menu_font.render("Player 1 (X):", True, self.RED)
+        p1_label = render_text(self._menu_font, "Player 1 (X):", self.RED)
         p1_label_rect = p1_label.get_rect(midright=(self._width // 2 - 160, self._height // 2 - 40))
         self._screen.blit(p1_label, p1_label_rect)
         
-        p2_label = self._menu_font.render("Player 2 (O):", True, self.BLUE)
+        p2_label = render_text(self._menu_font, "Player 2 (O):", self.BLUE)
         p2_label_rect = p2_label.get_rect(midright=(self._width // 2 - 160, self._height // 2 + 20))
         self._screen.blit(p2_label, p2_label_rect)
         
@@ -280,6 +434,9 @@ class GameUI:
         # Draw start button
         self._start_game_button.draw(self._screen)
         
+        # Draw human/computer toggle
+        self._computer_button.draw(self._screen)
+        
         # Draw back button
         self._back_button.draw(self._screen)
     
@@ -289,12 +446,12 @@ class GameUI:
         self._screen.fill(self.BLACK)
         
         # Draw title
-        title = self._title_font.render("Options", True, self.WHITE)
+        title = render_text(self._title_font, "Options", self.WHITE)
         title_rect = title.get_rect(center=(self._width // 2, 100))
         self._screen.blit(title, title_rect)
         
         # Draw resolution label
-        res_label = self._menu_font.render("Resolution:", True, self.WHITE)
+        res_label = render_text(self._menu_font, "Resolution:", self.WHITE)
         res_label_rect = res_label.get_rect(center=(self._width // 2, self._height // 2 - 150))
         self._screen.blit(res_label, res_label_rect)
         
@@ -314,29 +471,38 @@ class GameUI:
         self._screen.fill(self.BLACK)
         
         # Draw title
-        title = self._title_font.render("Game Log", True, self.WHITE)
+        title = render_text(self._title_font, "Game Log", self.WHITE)
         title_rect = title.get_rect(center=(self._width // 2, 50))
         self._screen.blit(title, title_rect)
         
-        # Draw log entries
-        if not self._log_entries:
-            self._load_log_entries()
-        
         # Create a surface for the log content
-        log_area = pygame.Rect(50, 100, self._width - 120, self._height - 200)
+        log_area = self._log_area
         pygame.draw.rect(self._screen, (20, 20, 20), log_area)
         pygame.draw.rect(self._screen, self.GRAY, log_area, 1)
         
         # Display log entries
-        max_visible_lines = (log_area.height - 20) // 20
-        start_idx = max(0, min(self._log_scroll_pos, len(self._log_entries) - max_visible_lines))
-        if start_idx < 0:
-            start_idx = 0
-        
-        for i, entry in enumerate(self._log_entries[start_idx:start_idx + max_visible_lines]):
-            y_pos = log_area.y + 10 + i * 20
-            log_text = self._log_font.render(entry.strip(), True, self.WHITE)
-            self._screen.blit(log_text, (log_area.x + 10, y_pos))
+        max_visible_lines = self._log_visible_lines
+        line_count = len(self._log_index)
+        start_idx = max(0, min(self._log_scroll_pos, line_count - max_visible_lines))
+        stop_idx = min(start_idx + max_visible_lines, line_count)
+        
+        if self._log_error:
+            log_text = self._log_font.render(self._log_error, True, self.WHITE)
+            self._screen.blit(log_text, (log_area.x + 10, log_area.y + 10))
+        else:
+            # Only read and render lines that weren't on screen last frame
+            cache = {index: self._log_line_cache[index]
+                     for index in range(start_idx, stop_idx) if index in self._log_line_cache}
+            if len(cache) < stop_idx - start_idx:
+                entries = self._log_index.get_lines(start_idx, stop_idx - start_idx)
+                for index, entry in enumerate(entries, start_idx):
+                    if index not in cache:
+                        cache[index] = self._log_font.render(entry.strip(), True, self.WHITE)
+            self._log_line_cache = cache
+            
+            for i, index in enumerate(range(start_idx, stop_idx)):
+                y_pos = log_area.y + 10 + i * 20
+                self._screen.blit(cache[index], (log_area.x + 10, y_pos))
         
         # Draw scroll buttons
         self._log_scroll_up.draw(self._screen)
@@ -346,63 +512,83 @@ class GameUI:
         self._back_button.draw(self._screen)
         
         # Draw scroll info
-        if self._log_entries:
-            scroll_info = f"{start_idx + 1}-{min(start_idx + max_visible_lines, len(self._log_entries))} of {len(self._log_entries)}"
-            info_text = self._button_font.render(scroll_info, True, self.GRAY)
+        if line_count:
+            scroll_info = f"{start_idx + 1}-{stop_idx} of {line_count}"
+            info_text = render_text(self._button_font, scroll_info, self.GRAY)
             self._screen.blit(info_text, (log_area.centerx - info_text.get_width() // 2, log_area.bottom + 10))
     
+    def _draw_stats_view(self):
+        """Draw the stats screen."""
+        # Draw background
+        self._screen.fill(self.BLACK)
+        
+        # Draw title
+        title = render_text(self._title_font, "Statistics", self.WHITE)
+        title_rect = title.get_rect(center=(self._width // 2, 50))
+        self._screen.blit(title, title_rect)
+        
+        summary = render_text(self._button_font, self._stats_summary, self.GRAY)
+        self._screen.blit(summary, summary.get_rect(center=(self._width // 2, 105)))
+        
+        area = self._stats_area
+        pygame.draw.rect(self._screen, (20, 20, 20), area)
+        pygame.draw.rect(self._screen, self.GRAY, area, 1)
+        
+        x = area.x + 10
+        y = area.y + 10
+        header = f"{'Player':<20} {'W':>5} {'L':>5} {'D':>5} {'Streak':>7} {'Best':>5}"
+        self._screen.blit(render_text(self._log_font, header, self.GRAY), (x, y))
+        for player in self._stats_players:
+            y += 20
+            streak = player["streak"]
+            streak = f"W{streak}" if streak > 0 else f"L{-streak}" if streak < 0 else "-"
+            line = (f"{player['name'][:20]:<20} {player['wins']:5d} {player['losses']:5d} "
+                    f"{player['draws']:5d} {streak:>7} {player['best_streak']:5d}")
+            color = self.GREEN if player["name"] == self._stats_selected else self.WHITE
+            self._screen.blit(render_text(self._log_font, line, color), (x, y))
+        
+        if not self._stats_players:
+            self._screen.blit(render_text(self._log_font, "No games played yet", self.WHITE),
+                              (x, y + 20))
+        else:
+            # The selected player's records against each opponent
+            y = area.y + 10 + (self._stats_rows + 2) * 20
+            header = f"{self._stats_selected[:20] + ' vs':<20} {'W':>5} {'L':>5} {'D':>5}"
+            self._screen.blit(render_text(self._log_font, header, self.GRAY), (x, y))
+            for record in self._stats_head_to_head:
+                y += 20
+                line = (f"{record['opponent'][:20]:<20} {record['wins']:5d} {record['losses']:5d} "
+                        f"{record['draws']:5d}")
+                self._screen.blit(render_text(self._log_font, line, self.WHITE), (x, y))
+        
+        # Draw back button
+        self._back_button.draw(self._screen)
+    
     def _draw_game(self):
         """Draw the game screen."""
         # Draw background
         self._screen.fill(self.BLACK)
         
         # Draw title
-        title = self._game_font.render("Tic-Tac-Toe", True, self.WHITE)
+        title = render_text(self._game_font, "Tic-Tac-Toe", self.WHITE)
         title_rect = title.get_rect(center=(self._width // 2, 30))
         self._screen.blit(title, title_rect)
         
-        # Draw board background
-        board_rect = pygame.Rect(
-            self._board_x, 
-            self._board_y, 
-            self._board_size_px, 
-            self._board_size_px
-        )
-        pygame.draw.rect(self._screen, self.BLACK, board_rect)
-        
-        # Draw grid lines
-        for i in range(self._board_size + 1):
-            # Vertical lines
-            pygame.draw.line(
-                self._screen,
-                self.WHITE,
-                (self._board_x + i * self._cell_size, self._board_y),
-                (self._board_x + i * self._cell_size, self._board_y + self._board_size_px),
-                2 if i == 0 or i == self._board_size else 1
-            )
-            
-            # Horizontal lines
-            pygame.draw.line(
-                self._screen,
-                self.WHITE,
-                (self._board_x, self._board_y + i * self._cell_size),
-                (self._board_x + self._board_size_px, self._board_y + i * self._cell_size),
-                2 if i == 0 or i == self._board_size else 1
-            )
+        # Draw the board with its grid
+        self._screen.blit(self._board_surface, (int(self._board_x) - 1, int(self._board_y) - 1))
         
         # Get winning positions
-        winning_positions = self._game.board.get_winning_positions()
-        
-        # Draw board marks
-        for row in range(self._board_size):
-            for col in range(self._board_size):
-                square = self._game.board.squares[row][col]
-                is_winning = winning_positions and (row, col) in winning_positions
-                
-                if square.value == 'X':
-                    self._draw_x(row, col, winning=is_winning)
-                elif square.value == 'O':
-                    self._draw_o(row, col, winning=is_winning)
+        board = self._game.board
+        winning_positions = set(board.get_winning_positions() or ())
+        
+        # Draw board marks, visiting only the marked squares of each symbol's bitmask
+        for symbol in ('X', 'O'):
+            bits = board.get_bits(symbol)
+            while bits:
+                low = bits & -bits
+                bits ^= low
+                row, col = divmod(low.bit_length() - 1, self._board_size)
+                self._draw_mark(symbol, row, col, (row, col) in winning_positions)
         
         # Draw game status
         status_text = self._game.get_game_status()
@@ -413,7 +599,7 @@ class GameUI:
         else:
             status_color = self.RED if self._game.current_player.symbol == 'X' else self.BLUE
         
-        status = self._game_font.render(status_text, True, status_color)
+        status = render_text(self._game_font, status_text, status_color)
         status_rect = status.get_rect(center=(self._width // 2, self._board_y - 20))
         self._screen.blit(status, status_rect)
         
@@ -421,7 +607,7 @@ class GameUI:
         self._reset_button.draw(self._screen)
         
         # Draw ESC hint
-        esc_text = self._button_font.render("Press ESC for menu", True, self.GRAY)
+        esc_text = render_text(self._button_font, "Press ESC for menu", self.GRAY)
         esc_rect = esc_text.get_rect(bottomright=(self._width - 20, self._height - 20))
         self._screen.blit(esc_text, esc_rect)
     
@@ -441,7 +627,9 @@ class GameUI:
                         self._state = action
                         # If viewing log, load the log entries
                         if action == self.VIEW_LOG:
-                            self._load_log_entries()
+                            self._refresh_log()
+                        elif action == self.VIEW_STATS:
+                            self._refresh_stats()
                         # If starting a new game, reset the game
                         if action == self.NAME_INPUT and self._game_in_progress:
                             # We'll create a new game when they submit names
@@ -454,6 +642,7 @@ class GameUI:
         """Handle events for the name input screen."""
         if event.type == pygame.MOUSEMOTION:
             self._start_game_button.check_hover(event.pos)
+            self._computer_button.check_hover(event.pos)
             self._back_button.check_hover(event.pos)
         
         elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -461,11 +650,23 @@ class GameUI:
             if action:
                 self._player1_name = self._player1_input.text if self._player1_input.text else "Player X"
                 self._player2_name = self._player2_input.text if self._player2_input.text else "Player O"
-                self._game = TicTacToeGame(self._player1_name, self._player2_name, logger=self._logger)
+                players = None
+                if self._vs_computer:
+                    players = [
+                        Player('X', self._player1_name),
+                        ComputerPlayer('O', self._player2_name, time_limit=0.5)
+                    ]
+                self._game = TicTacToeGame(self._player1_name, self._player2_name,
+                                           logger=self._logger, players=players)
                 self._game_in_progress = True
                 self._setup_game_elements()
                 self._state = self.GAME
             
+            action = self._computer_button.check_click(event.pos)
+            if action == "toggle_computer":
+                self._vs_computer = not self._vs_computer
+                self._computer_button.text = self._computer_button_text()
+            
             action = self._back_button.check_click(event.pos)
             if action:
                 self._state = action
@@ -516,7 +717,7 @@ class GameUI:
             
             action = self._log_scroll_down.check_click(event.pos)
             if action == "scroll_down":
-                max_scroll = max(0, len(self._log_entries) - 10)  # Assuming 10 visible lines
+                max_scroll = self._max_log_scroll()
                 self._log_scroll_pos = min(max_scroll, self._log_scroll_pos + 1)
             
             # Handle back button
@@ -530,11 +731,31 @@ class GameUI:
             if event.y > 0:  # Scroll up
                 self._log_scroll_pos = max(0, self._log_scroll_pos - 3)
             elif event.y < 0:  # Scroll down
-                max_scroll = max(0, len(self._log_entries) - 10)  # Assuming 10 visible lines
+                max_scroll = self._max_log_scroll()
                 self._log_scroll_pos = min(max_scroll, self._log_scroll_pos + 3)
         
         return True
     
+    def _handle_stats_view_events(self, event):
+        """Handle events for the stats screen."""
+        if event.type == pygame.MOUSEMOTION:
+            self._back_button.check_hover(event.pos)
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            # Clicking a player shows their head-to-head records
+            index = self._stats_row_at(event.pos)
+            if index is not None:
+                self._stats_selected = self._stats_players[index]["name"]
+                self._refresh_stats()
+            
+            # Handle back button
+            if self._back_button.rect.collidepoint(event.pos):
+                self._state = self.MAIN_MENU
+                # Recreate UI elements to ensure main menu is updated
+                self._create_ui_elements()
+        
+        return True
+    
     def _handle_game_events(self, event):
         """Handle events for the game screen."""
         if event.type == pygame.KEYDOWN:
@@ -550,7 +771,7 @@ class GameUI:
         elif event.type == pygame.MOUSEBUTTONDOWN:
             # Handle click on board
             cell = self._get_cell_from_pos(event.pos)
-            if cell and not self._game.is_game_over:
+            if cell and not self._game.is_game_over and not self._game.current_player.is_computer:
                 row, col = cell
                 self._game.make_move(row, col)
             
@@ -561,50 +782,224 @@ class GameUI:
         
         return True
     
-    def run(self):
-        """Run the game loop."""
+    def _handle_event(self, event):
+        """Handle an event for the current screen and invalidate what it changed."""
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+            if event.key == pygame.K_F3:
+                self._show_overlay = not self._show_overlay
+                self._update_instrumentation()
+            elif profiler.enabled:
+                path = profiler.dump()
+                if path:
+                    print(f"Instrumentation written to {path}")
+            self._invalidate()
+            return True
+        
+        state = self._state
+        buttons = self._current_buttons()
+        hovered = [button.hovered for button in buttons]
+        
+        # Handle events based on current state
+        running = True
+        if self._state == self.MAIN_MENU:
+            running = self._handle_main_menu_events(event)
+        elif self._state == self.NAME_INPUT:
+            running = self._handle_name_input_events(event)
+        elif self._state == self.OPTIONS:
+            running = self._handle_options_events(event)
+        elif self._state == self.VIEW_LOG:
+            running = self._handle_log_view_events(event)
+        elif self._state == self.VIEW_STATS:
+            running = self._handle_stats_view_events(event)
+        elif self._state == self.GAME:
+            running = self._handle_game_events(event)
+        
+        if self._state != state or event.type in self.REDRAW_EVENTS:
+            self._invalidate()
+        elif event.type == pygame.MOUSEMOTION:
+            # Hovering only changes the look of the buttons it enters or leaves
+            for button, was_hovered in zip(buttons, hovered):
+                if button.hovered != was_hovered:
+                    self._invalidate(button.rect)
+        return running
+    
+    def _current_buttons(self):
+        """Get the buttons shown on the current screen."""
+        if self._state == self.MAIN_MENU:
+            return self._main_menu_buttons
+        if self._state == self.NAME_INPUT:
+            return [self._start_game_button, self._computer_button, self._back_button]
+        if self._state == self.OPTIONS:
+            return self._resolution_buttons + [self._back_button]
+        if self._state == self.VIEW_LOG:
+            return [self._log_scroll_up, self._log_scroll_down, self._back_button]
+        if self._state == self.VIEW_STATS:
+            return [self._back_button]
+        if self._state == self.GAME:
+            return [self._reset_button]
+        return []
+    
+    def _invalidate(self, rect=None):
+        """Mark a screen region, or the whole screen if rect is None, for redrawing."""
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+    
+    def _idle_timeout(self):
+        """
+        Get how long the game loop may wait for events before it has work to do.
+        
+        Returns:
+            int or None: A timeout in milliseconds, 0 to not wait at all, or None
+                         to wait for the next event however long it takes
+        """
+        timeout = self._screen_timeout()
+        if self._show_overlay:
+            elapsed = get_ticks() - self._overlay_refresh_time
+            overlay_timeout = max(1, self.OVERLAY_REFRESH_INTERVAL - elapsed)
+            timeout = overlay_timeout if timeout is None else min(timeout, overlay_timeout)
+        return timeout
+    
+    def _screen_timeout(self):
+        """Get the idle timeout needed by the current screen, as for _idle_timeout."""
+        if self._state == self.GAME:
+            if not self._game.is_game_over and self._game.current_player.is_computer:
+                return 0
+        elif self._state == self.NAME_INPUT:
+            # Wake up in time to blink the cursor of the active input
+            active = [text_input for text_input in (self._player1_input, self._player2_input)
+                      if text_input.active]
+            if active:
+                return max(1, min(text_input.time_until_blink() for text_input in active))
+        elif self._state == self.VIEW_LOG:
+            elapsed = get_ticks() - self._log_refresh_time
+            return max(1, self.LOG_REFRESH_INTERVAL - elapsed)
+        return None
+    
+    def _redraw(self):
+        """Draw the invalidated parts of the current screen and show them."""
+        if self._full_redraw:
+            self._draw_screen()
+            if self._show_overlay:
+                self._draw_overlay()
+            pygame.display.flip()
+        elif self._dirty_rects:
+            # Drawing is clipped to the changed area, so the rest is left alone
+            self._screen.set_clip(self._dirty_rects[0].unionall(self._dirty_rects[1:]))
+            self._draw_screen()
+            if self._show_overlay:
+                self._draw_overlay()
+            self._screen.set_clip(None)
+            pygame.display.update(self._dirty_rects)
+        self._full_redraw = False
+        self._dirty_rects = []
+    
+    def _draw_screen(self):
+        """Draw the current screen."""
+        if self._state == self.MAIN_MENU:
+            self._draw_main_menu()
+        elif self._state == self.NAME_INPUT:
+            self._draw_name_input()
+        elif self._state == self.OPTIONS:
+            self._draw_options()
+        elif self._state == self.VIEW_LOG:
+            self._draw_log_view()
+        elif self._state == self.VIEW_STATS:
+            self._draw_stats_view()
+        elif self._state == self.GAME:
+            self._draw_game()
+    
+    def _update_instrumentation(self):
+        """Turn the profiler on or off to match the instrument flag and the overlay."""
+        if self._instrument or self._show_overlay:
+            if not profiler.enabled:
+                profiler.enable(default_targets() + method_targets(GameUI, ("_draw_", "_handle_")))
+        elif profiler.enabled:
+            profiler.disable()
+    
+    def _draw_overlay(self):
+        """Draw the frame times and the busiest instrumented methods over the screen."""
+        lines = profiler.report_lines(limit=8) or ["Collecting..."]
+        lines.insert(0, "Debug (F3 hide, F4 dump)")
+        surfaces = [self._log_font.render(line, True, self.WHITE) for line in lines]
+        width = max(surface.get_width() for surface in surfaces) + 10
+        height = len(surfaces) * 18 + 10
+        background = pygame.Surface((width, height), pygame.SRCALPHA)
+        background.fill((0, 0, 0, 200))
+        self._screen.blit(background, (5, 5))
+        for i, surface in enumerate(surfaces):
+            self._screen.blit(surface, (10, 10 + i * 18))
+        self._overlay_refresh_time = get_ticks()
+    
+    def run(self, max_frames=None):
+        """
+        Run the game loop.
+        
+        Args:
+            max_frames (int or None): Stop after this many frames, as when
+                                      measuring startup time
+        """
         running = True
+        frames = 0
         
         while running:
+            frame_start = time.perf_counter()
+            waited = 0.0
+            
+            # Let a computer player move once the previous frame is on screen
+            if self._state == self.GAME and self._game.make_computer_move():
+                self._invalidate()
+            
+            # Sleep until an event arrives when there's nothing to redraw
+            timeout = self._idle_timeout()
+            if self._full_redraw or self._dirty_rects or timeout == 0:
+                events = pygame.event.get()
+            else:
+                wait_start = time.perf_counter()
+                event = pygame.event.wait(timeout) if timeout else pygame.event.wait()
+                waited = time.perf_counter() - wait_start
+                events = [event] + pygame.event.get()
+            
             # Handle events
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                     break
                 
-                # Handle events based on current state
-                if self._state == self.MAIN_MENU:
-                    running = self._handle_main_menu_events(event)
-                elif self._state == self.NAME_INPUT:
-                    running = self._handle_name_input_events(event)
-                elif self._state == self.OPTIONS:
-                    running = self._handle_options_events(event)
-                elif self._state == self.VIEW_LOG:
-                    running = self._handle_log_view_events(event)
-                elif self._state == self.GAME:
-                    running = self._handle_game_events(event)
+                running = self._handle_event(event)
+                if not running:
+                    break
             
             # Update UI elements
             if self._state == self.NAME_INPUT:
-                self._player1_input.update()
-                self._player2_input.update()
-            
-            # Draw current screen
-            if self._state == self.MAIN_MENU:
-                self._draw_main_menu()
-            elif self._state == self.NAME_INPUT:
-                self._draw_name_input()
-            elif self._state == self.OPTIONS:
-                self._draw_options()
+                for text_input in (self._player1_input, self._player2_input):
+                    if text_input.update():
+                        self._invalidate(text_input.rect)
             elif self._state == self.VIEW_LOG:
-                self._draw_log_view()
-            elif self._state == self.GAME:
-                self._draw_game()
+                if get_ticks() - self._log_refresh_time >= self.LOG_REFRESH_INTERVAL:
+                    if self._refresh_log():
+                        self._invalidate()
+            if self._show_overlay:
+                if get_ticks() - self._overlay_refresh_time >= self.OVERLAY_REFRESH_INTERVAL:
+                    self._invalidate()
             
-            # Update display
-            pygame.display.flip()
+            # Draw whatever changed
+            self._redraw()
+            
+            if profiler.enabled:
+                # Time spent waiting for events isn't part of the frame
+                profiler.record_frame(time.perf_counter() - frame_start - waited)
+            
+            frames += 1
+            if max_frames is not None and frames >= max_frames:
+                break
             
             # Cap the frame rate
             self._clock.tick(60)
         
+        self._logger.close()
+        self._stats.close()
+        if profiler.enabled:
+            profiler.disable()
         pygame.quit()
\ No newline at end of file
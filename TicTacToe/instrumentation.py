@@ -0,0 +1,208 @@
+import functools
+import json
+import time
+from collections import deque
+from datetime import datetime
+
+# Latencies are counted in power-of-two buckets of microseconds; bucket i
+# holds calls that took less than 2 ** i microseconds
+_BUCKETS = 32
+
+class _MethodStats:
+    """Call count and latency histogram of one instrumented method."""
+    __slots__ = ("count", "total", "max", "buckets")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * _BUCKETS
+    
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(_BUCKETS - 1, int(seconds * 1e6).bit_length())] += 1
+    
+    def percentile(self, fraction):
+        """Get an upper bound in seconds on the given fraction of call times."""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(self.max, (1 << index) / 1e6)
+        return self.max
+
+class Profiler:
+    """
+    Records call counts, latency histograms and frame times.
+    
+    Methods are only wrapped while the profiler is enabled. enable() swaps
+    each target method on its class for a timing wrapper and disable() puts
+    the original back, so a disabled profiler costs nothing at all on the
+    hot paths. Frame times are kept for the last frame_window frames.
+    """
+    def __init__(self, frame_window=600):
+        self._stats = {}
+        self._frames = deque(maxlen=frame_window)
+        self._patched = []
+        self._enabled = False
+    
+    @property
+    def enabled(self):
+        return self._enabled
+    
+    def enable(self, targets=None):
+        """
+        Start recording calls to the target methods.
+        
+        Args:
+            targets (list or None): (class, method name) pairs to instrument
+                                    (defaults to default_targets())
+        """
+        if self._enabled:
+            return
+        for cls, name in (targets if targets is not None else default_targets()):
+            original = cls.__dict__.get(name)
+            method = getattr(cls, name)
+            setattr(cls, name, self._wrap(method, f"{cls.__name__}.{name}"))
+            self._patched.append((cls, name, original))
+        self._enabled = True
+    
+    def disable(self):
+        """Stop recording and restore the original methods."""
+        for cls, name, original in reversed(self._patched):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._patched = []
+        self._enabled = False
+    
+    def _wrap(self, method, name):
+        stats = self._stats.setdefault(name, _MethodStats())
+        clock = time.perf_counter
+        
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stats.add(clock() - start)
+        return wrapper
+    
+    def record_frame(self, seconds):
+        """Record the time a frame took to handle and draw."""
+        self._frames.append(seconds)
+    
+    def reset(self):
+        """Forget everything recorded so far."""
+        for stats in self._stats.values():
+            stats.__init__()
+        self._frames.clear()
+    
+    def frame_percentiles(self, fractions=(0.5, 0.95, 0.99)):
+        """
+        Get frame time percentiles over the recent frames.
+        
+        Returns:
+            dict: A map from each fraction to a frame time in seconds, or an
+                  empty dict if no frames were recorded
+        """
+        if not self._frames:
+            return {}
+        times = sorted(self._frames)
+        return {fraction: times[min(len(times) - 1, int(fraction * len(times)))]
+                for fraction in fractions}
+    
+    def summary(self):
+        """
+        Summarize what was recorded.
+        
+        Returns:
+            dict: 'methods', mapping each method name to its count, total,
+                  mean, p50, p95, p99 and max times in milliseconds and its
+                  histogram, and 'frames', with frame time percentiles in
+                  milliseconds
+        """
+        methods = {}
+        for name, stats in self._stats.items():
+            if not stats.count:
+                continue
+            methods[name] = {
+                "count": stats.count,
+                "total_ms": stats.total * 1000,
+                "mean_ms": stats.total / stats.count * 1000,
+                "p50_ms": stats.percentile(0.5) * 1000,
+                "p95_ms": stats.percentile(0.95) * 1000,
+                "p99_ms": stats.percentile(0.99) * 1000,
+                "max_ms": stats.max * 1000,
+                "histogram_us": {f"<{1 << index}": count
+                                 for index, count in enumerate(stats.buckets) if count}
+            }
+        frames = {f"p{round(fraction * 100)}_ms": seconds * 1000
+                  for fraction, seconds in self.frame_percentiles().items()}
+        frames["count"] = len(self._frames)
+        return {"methods": methods, "frames": frames}
+    
+    def report_lines(self, limit=10):
+        """Format the frame times and the methods with the most total time as text lines."""
+        summary = self.summary()
+        frames = summary["frames"]
+        lines = []
+        if frames["count"]:
+            lines.append(f"frame p50 {frames['p50_ms']:.2f}ms  p95 {frames['p95_ms']:.2f}ms  "
+                         f"p99 {frames['p99_ms']:.2f}ms")
+        methods = sorted(summary["methods"].items(), key=lambda item: -item[1]["total_ms"])
+        for name, stats in methods[:limit]:
+            lines.append(f"{name}: {stats['count']} calls, mean {stats['mean_ms']:.3f}ms, "
+                         f"p95 {stats['p95_ms']:.3f}ms")
+        return lines
+    
+    def dump(self, path=None):
+        """
+        Write the summary to a JSON file.
+        
+        Args:
+            path (str or None): The file to write (defaults to a timestamped
+                                name in the current directory)
+        
+        Returns:
+            str or None: The path written, or None if it couldn't be written
+        """
+        if path is None:
+            path = datetime.now().strftime("instrumentation_%Y%m%d_%H%M%S.json")
+        try:
+            with open(path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+            return path
+        except Exception as e:
+            print(f"Error writing instrumentation dump: {e}")
+            return None
+
+def method_targets(cls, prefixes):
+    """Get (class, name) targets for the methods of a class whose names start with a prefix."""
+    return [(cls, name) for name, value in vars(cls).items()
+            if callable(value) and name.startswith(tuple(prefixes))]
+
+def default_targets():
+    """Get the game logic and logging methods instrumented by default."""
+    from board import Board
+    from game import TicTacToeGame
+    from game_logger import BufferedGameLogger, GameLogger
+    from structured_log import StructuredGameLogger
+    
+    return [
+        (TicTacToeGame, "make_move"),
+        (Board, "get_winner"),
+        (Board, "is_full"),
+        (GameLogger, "log_result"),
+        (BufferedGameLogger, "log_result"),
+        (StructuredGameLogger, "log_result")
+    ]
+
+# The profiler shared by the game
+profiler = Profiler()
\ No newline at end of file
@@ -0,0 +1,154 @@
+import os
+from array import array
+from itertools import islice
+
+from game_logger import log_segments, open_log_segment
+
+class LogLineIndex:
+    """
+    An index of the line offsets in a text log file.
+    
+    The file is scanned once to record where each line starts, and later
+    calls to refresh() only scan the bytes appended since, so lines can be
+    read a window at a time without loading the whole file. A line is only
+    indexed once its newline has been written.
+    
+    The closed segments of a rotated log come before the file's own lines.
+    They never change, so only their line counts are kept, and a window
+    that falls in one is read by streaming through that segment.
+    """
+    def __init__(self, path, chunk_size=1024 * 1024):
+        self._path = path
+        self._chunk_size = chunk_size
+        self._segments = []
+        self._segment_lines = 0
+        self._reset()
+    
+    def _reset(self):
+        self._starts = array("Q")
+        self._end = 0
+        self._scanned = 0
+    
+    def __len__(self):
+        return self._segment_lines + len(self._starts)
+    
+    @property
+    def path(self):
+        return self._path
+    
+    def refresh(self):
+        """
+        Index any complete lines appended since the last refresh.
+        
+        If the file has been rotated, the new segments are counted and the
+        file is indexed from the start again, as it is if it has shrunk or
+        been replaced.
+        
+        Returns:
+            int: The number of new lines
+        """
+        total = len(self)
+        self._refresh_segments()
+        self._refresh_file()
+        return len(self) - total
+    
+    def _refresh_segments(self):
+        """Count the lines of segments closed since the last refresh."""
+        segments = [(number, path) for number, path in log_segments(self._path) if number is not None]
+        numbers = [number for number, _ in segments]
+        known = [number for number, _, _ in self._segments]
+        if numbers[:len(known)] != known:
+            # Old segments were removed, so line numbers have changed
+            self._segments = []
+            self._segment_lines = 0
+            self._reset()
+            known = []
+        
+        # A segment keeps its number when it's compressed, but not its path
+        for index, (number, path) in enumerate(segments[:len(known)]):
+            self._segments[index] = (number, path, self._segments[index][2])
+        
+        if len(segments) > len(known):
+            for number, path in segments[len(known):]:
+                count = self._count_lines(path)
+                self._segments.append((number, path, count))
+                self._segment_lines += count
+            # The file being indexed was rotated into a segment
+            self._reset()
+    
+    def _count_lines(self, path):
+        """Count the lines in a closed segment."""
+        try:
+            with open_log_segment(path) as f:
+                return sum(1 for _ in f)
+        except OSError as e:
+            print(f"Error reading log segment: {e}")
+            return 0
+    
+    def _refresh_file(self):
+        """Index the complete lines appended to the file being written."""
+        try:
+            size = os.path.getsize(self._path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._scanned:
+            self._reset()
+        if size == self._scanned:
+            return 0
+        
+        before = len(self._starts)
+        with open(self._path, "rb") as f:
+            f.seek(self._scanned)
+            position = self._scanned
+            while position < size:
+                chunk = f.read(min(self._chunk_size, size - position))
+                if not chunk:
+                    break
+                newline = chunk.find(b"\n")
+                while newline != -1:
+                    self._starts.append(self._end)
+                    self._end = position + newline + 1
+                    newline = chunk.find(b"\n", newline + 1)
+                position += len(chunk)
+        self._scanned = position
+        return len(self._starts) - before
+    
+    def get_lines(self, start, count):
+        """
+        Read a window of lines.
+        
+        Args:
+            start (int): The index of the first line
+            count (int): The maximum number of lines to read
+        
+        Returns:
+            list: The lines, without their line endings
+        """
+        start = max(0, start)
+        lines = []
+        
+        # Lines in closed segments are streamed from the segment's start
+        first = 0
+        for _, path, line_count in self._segments:
+            if len(lines) >= count:
+                break
+            if start < first + line_count:
+                skip = max(0, start - first)
+                with open_log_segment(path) as f:
+                    for line in islice(f, skip, skip + count - len(lines)):
+                        lines.append(line.rstrip("\r\n"))
+            first += line_count
+        
+        start = max(0, start - self._segment_lines)
+        stop = min(len(self._starts), start + count - len(lines))
+        if start >= stop:
+            return lines
+        
+        begin = self._starts[start]
+        end = self._starts[stop] if stop < len(self._starts) else self._end
+        with open(self._path, "rb") as f:
+            f.seek(begin)
+            data = f.read(end - begin)
+        # The window always ends with a newline, so the last piece is empty
+        file_lines = data.decode("utf-8", errors="replace").split("\n")[:-1]
+        return lines + [line.rstrip("\r") for line in file_lines]
\ No newline at end of file
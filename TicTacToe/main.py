@@ -1,9 +1,26 @@
-from game_ui import GameUI
+import sys
+import time
 
 def main():
     """Main function to start the game."""
+    # pygame is only imported with the UI, so the game logic modules can be
+    # used without it
+    start = time.perf_counter()
+    from game_ui import GameUI
+    imported = time.perf_counter()
+    
     # Create and start the game UI
     ui = GameUI()
+    if "--startup-time" in sys.argv[1:]:
+        # Show one frame and report how long each stage of startup took
+        created = time.perf_counter()
+        ui.run(max_frames=1)
+        shown = time.perf_counter()
+        print(f"Import UI:    {(imported - start) * 1000:8.1f} ms")
+        print(f"Create UI:    {(created - imported) * 1000:8.1f} ms")
+        print(f"First frame:  {(shown - created) * 1000:8.1f} ms")
+        print(f"Total:        {(shown - start) * 1000:8.1f} ms")
+        return
     ui.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from player import Player
+
+class _Node:
+    """A node of the search tree, reached by playing move as mover."""
+    __slots__ = ("move", "mover", "parent", "children", "untried", "visits", "wins")
+    
+    def __init__(self, move, mover, parent, untried):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+    
+    def select_child(self, exploration):
+        """Pick the child with the highest UCT score."""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits)
+        )
+
+def _other(symbol):
+    return 'O' if symbol == 'X' else 'X'
+
+def _candidate_moves(board, neighbourhood):
+    """Get the moves worth trying, limited to squares near marks on k-in-a-row boards."""
+    if board.get_winner() is not None:
+        return []
+    near = neighbourhood if board.win_length < board.size else None
+    return board.available_moves(near)
+
+def run_search(board, symbol, iterations=None, time_limit=None, exploration=1.4,
+               neighbourhood=1, seed=None):
+    """
+    Run a single-threaded Monte Carlo tree search from a position.
+    
+    This is the unit of work for each worker process when the search is run
+    in parallel, so it only takes and returns picklable values.
+    
+    Args:
+        board (Board): The position to search
+        symbol (str): The symbol of the player to move
+        iterations (int or None): The number of simulations to run
+        time_limit (float or None): The number of seconds to search for
+        exploration (float): The UCT exploration constant
+        neighbourhood (int): How far from existing marks moves are tried on
+                             k-in-a-row boards
+        seed (int or None): The seed for the random playouts
+    
+    Returns:
+        dict: A map from (row, col) moves to (visits, wins) for the root's children
+    """
+    if iterations is None and time_limit is None:
+        raise ValueError("run_search needs an iteration count or a time limit")
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    root = _Node(None, _other(symbol), None, _candidate_moves(board, neighbourhood))
+    
+    # Every iteration plays out on the same copy and takes its moves back
+    state = board.copy()
+    size = state.size
+    
+    done = 0
+    while (iterations is None or done < iterations) and \
+            (deadline is None or time.perf_counter() < deadline):
+        node = root
+        
+        # Selection
+        while not node.untried and node.children:
+            node = node.select_child(exploration)
+            state.push(node.move[0] * size + node.move[1], node.mover)
+        
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            mover = _other(node.mover)
+            state.push(move[0] * size + move[1], mover)
+            child = _Node(move, mover, node, _candidate_moves(state, neighbourhood))
+            node.children.append(child)
+            node = child
+        
+        # Simulation
+        mover = node.mover
+        if state.get_winner() is None and not state.is_full():
+            moves = state.available_moves()
+            rng.shuffle(moves)
+            for row, col in moves:
+                mover = _other(mover)
+                state.push(row * size + col, mover)
+                if state.get_winner() is not None:
+                    break
+        winner = state.get_winner()
+        while state.ply > board.ply:
+            state.pop()
+        
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.mover:
+                node.wins += 1.0
+            node = node.parent
+        done += 1
+    
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+class MCTSPlayer(Player):
+    """
+    A computer player that chooses its moves with Monte Carlo tree search.
+    
+    Simulations are random playouts guided by UCT scores. With more than one
+    worker the search uses root parallelization: every worker process grows
+    its own tree from the current position and the visit counts of the root
+    moves are summed, so throughput scales with the number of cores. Each
+    move is limited by a number of iterations, a time limit, or both.
+    
+    Attributes:
+        symbol (str): The player's symbol ('X' or 'O')
+        name (str): The player's name
+        iterations (int or None): The number of simulations per move, split
+                                  across the workers
+        time_limit (float or None): The number of seconds allowed per move
+        workers (int): The number of worker processes
+    """
+    def __init__(self, symbol, name=None, iterations=None, time_limit=1.0, workers=None,
+                 exploration=1.4, neighbourhood=1, seed=None):
+        super().__init__(symbol, name if name else f"Computer {symbol}")
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTSPlayer needs an iteration count or a time limit")
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._workers = workers if workers else os.cpu_count() or 1
+        self._exploration = exploration
+        self._neighbourhood = neighbourhood
+        self._rng = random.Random(seed)
+        self._executor = None
+    
+    @property
+    def is_computer(self):
+        return True
+    
+    @property
+    def iterations(self):
+        return self._iterations
+    
+    @property
+    def time_limit(self):
+        return self._time_limit
+    
+    @property
+    def workers(self):
+        return self._workers
+    
+    def choose_move(self, board):
+        """
+        Choose a move for this player on the given board.
+        
+        Args:
+            board (Board): The board to move on
+        
+        Returns:
+            tuple or None: The (row, col) position to mark, or None if the
+                           game on the board is already over
+        """
+        if board.get_winner() is not None or board.is_full():
+            return None
+        
+        seeds = [self._rng.getrandbits(32) for _ in range(self._workers)]
+        if self._workers == 1:
+            results = [run_search(board, self.symbol, self._iterations, self._time_limit,
+                                  self._exploration, self._neighbourhood, seeds[0])]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            futures = []
+            for index, seed in enumerate(seeds):
+                iterations = None
+                if self._iterations is not None:
+                    # Spread the iterations evenly over the workers
+                    iterations = self._iterations // self._workers
+                    if index < self._iterations % self._workers:
+                        iterations += 1
+                futures.append(self._executor.submit(
+                    run_search, board, self.symbol, iterations, self._time_limit,
+                    self._exploration, self._neighbourhood, seed
+                ))
+            results = [future.result() for future in futures]
+        
+        totals = {}
+        for result in results:
+            for move, (visits, wins) in result.items():
+                total = totals.get(move, (0, 0.0))
+                totals[move] = (total[0] + visits, total[1] + wins)
+        if not totals:
+            return board.available_moves()[0]
+        return max(totals, key=lambda move: totals[move])
+    
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
\ No newline at end of file
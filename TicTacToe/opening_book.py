@@ -0,0 +1,357 @@
+import argparse
+import os
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from board import Board
+from structured_log import StructuredGameLogger
+
+DEFAULT_OPENING_BOOK_FILE = "opening_book.bin"
+
+# File layout: a header, then every node's canonical hash, then its games,
+# wins and draws
+_MAGIC = b"TTOB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBBBBI")
+
+_SYMBOLS = ('X', 'O')
+
+class OpeningBook:
+    """
+    Win statistics for the opening moves of recorded games.
+    
+    The book is a trie of the positions reached in the first max_ply moves
+    of each game. Nodes are keyed by the position's canonical hash, so
+    games that reach the same position by a different move order or in a
+    rotated or reflected orientation share a node. Each node counts the
+    games that passed through it and how many of them were won or drawn by
+    the player who made the move into it; the candidate moves of a position
+    are its children, found by trying each empty square.
+    
+    Nodes are held in a dict from hash to slot and one flat array('I') of
+    counts, which is also how they are written to disk.
+    
+    Attributes:
+        board_size (int): The size of the boards the book is for
+        win_length (int): The number of marks in a row needed to win
+        max_ply (int): The number of moves of each game that are recorded
+    """
+    def __init__(self, board_size=3, win_length=None, max_ply=8):
+        if win_length is None:
+            win_length = board_size
+        if not 1 <= max_ply <= 255:
+            raise ValueError(f"max_ply must be between 1 and 255, got {max_ply}")
+        self._board_size = board_size
+        self._win_length = win_length
+        self._max_ply = max_ply
+        self._slots = {}
+        self._counts = array("I")
+        self._games = 0
+    
+    @property
+    def board_size(self):
+        return self._board_size
+    
+    @property
+    def win_length(self):
+        return self._win_length
+    
+    @property
+    def max_ply(self):
+        return self._max_ply
+    
+    @property
+    def positions(self):
+        """The number of positions in the book."""
+        return len(self._slots)
+    
+    @property
+    def games(self):
+        """The number of games added to the book since it was created or loaded."""
+        return self._games
+    
+    def add_game(self, cells, winner=None):
+        """
+        Add the opening of a game to the book.
+        
+        Args:
+            cells (sequence): The cell index of each move, row * size + col,
+                              starting with X's first move
+            winner (int or None): 0 if X won, 1 if O won, None for a draw
+        
+        Returns:
+            bool: True if the game was added, False if its moves aren't legal
+                  on the book's board
+        """
+        board = Board(self._board_size, self._win_length)
+        cells = list(cells[:self._max_ply])
+        if len(set(cells)) != len(cells) or any(not 0 <= cell < board.size ** 2 for cell in cells):
+            return False
+        
+        for ply, cell in enumerate(cells):
+            board.push(cell, _SYMBOLS[ply % 2])
+            slot = self._slots.get(board.canonical_hash)
+            if slot is None:
+                slot = len(self._counts)
+                self._slots[board.canonical_hash] = slot
+                self._counts.extend((0, 0, 0))
+            self._counts[slot] += 1
+            if winner is None:
+                self._counts[slot + 2] += 1
+            elif winner == ply % 2:
+                self._counts[slot + 1] += 1
+            if board.get_winner() is not None:
+                break
+        self._games += 1
+        return True
+    
+    def add_history(self, history, winner=None):
+        """Add the opening of a game from its GameHistory, as for add_game."""
+        return self.add_game(history.cells, winner)
+    
+    def add_record(self, record):
+        """
+        Add the opening of a game from a StructuredGameLogger record.
+        
+        Returns:
+            bool: True if the game was added, False if it has no moves or
+                  they aren't legal on the book's board
+        """
+        if not record.moves:
+            return False
+        if any(not (0 <= row < self._board_size and 0 <= col < self._board_size)
+               for row, col in record.moves):
+            return False
+        # The result code says who won even when both players share a name
+        winner = None
+        if record.result == StructuredGameLogger.PLAYER1_WON:
+            winner = 0
+        elif record.result == StructuredGameLogger.PLAYER2_WON:
+            winner = 1
+        return self.add_game([row * self._board_size + col for row, col in record.moves], winner)
+    
+    def lookup(self, board):
+        """
+        Get the book's statistics for each move from a position.
+        
+        Args:
+            board (Board): The position, with X moving first
+        
+        Returns:
+            list: A ((row, col), games, wins, draws) tuple per move in the
+                  book, where wins and draws are counted for the player to
+                  move, most played first. Moves that give the same
+                  position up to symmetry share their statistics. Empty if
+                  the position is out of book or the board doesn't match
+                  the book.
+        """
+        if (board.size != self._board_size or board.win_length != self._win_length
+                or board.ply >= self._max_ply or board.get_winner() is not None):
+            return []
+        
+        board = board.copy()
+        symbol = _SYMBOLS[board.ply % 2]
+        moves = []
+        for row, col in board.available_moves():
+            board.push(row * self._board_size + col, symbol)
+            slot = self._slots.get(board.canonical_hash)
+            board.pop()
+            if slot is not None:
+                moves.append(((row, col),) + tuple(self._counts[slot:slot + 3]))
+        moves.sort(key=lambda move: (-move[1], move[0]))
+        return moves
+    
+    def choose_move(self, board, min_games=10):
+        """
+        Choose the book move with the best score from a position.
+        
+        A move scores 1 for each win and a half for each draw, averaged over
+        its games. Moves played fewer than min_games times are ignored.
+        
+        Returns:
+            tuple or None: The (row, col) position to mark, or None if the
+                           position is out of book
+        """
+        best_move, best_score = None, None
+        for move, games, wins, draws in self.lookup(board):
+            if games < min_games:
+                continue
+            score = (wins + draws / 2) / games
+            if best_score is None or score > best_score:
+                best_move, best_score = move, score
+        return best_move
+    
+    def save(self, path=DEFAULT_OPENING_BOOK_FILE):
+        """
+        Write the book to a file, replacing it atomically.
+        
+        Returns:
+            bool: True if the book was written, False otherwise
+        """
+        hashes = array("Q", self._slots)
+        counts = array("I", self._counts)
+        if sys.byteorder != "little":
+            hashes.byteswap()
+            counts.byteswap()
+        
+        temp_path = path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self._board_size, self._win_length,
+                                     self._max_ply, len(hashes)))
+                f.write(hashes.tobytes())
+                f.write(counts.tobytes())
+            os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error writing opening book: {e}")
+            return False
+    
+    @classmethod
+    def load(cls, path=DEFAULT_OPENING_BOOK_FILE):
+        """
+        Read a book written by save().
+        
+        Raises:
+            ValueError: If the file isn't an opening book
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} is not an opening book file")
+        magic, version, size, win_length, max_ply, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or len(data) != _HEADER.size + 20 * count:
+            raise ValueError(f"{path} is not an opening book file")
+        
+        hashes = array("Q")
+        hashes.frombytes(data[_HEADER.size:_HEADER.size + 8 * count])
+        book = cls(size, win_length, max_ply)
+        book._counts.frombytes(data[_HEADER.size + 8 * count:])
+        if sys.byteorder != "little":
+            hashes.byteswap()
+            book._counts.byteswap()
+        book._slots = {key: 3 * index for index, key in enumerate(hashes)}
+        return book
+
+def play_book_games(x_strategy, o_strategy, games, board_size=3, win_length=None, seed=None):
+    """
+    Play a batch of self-play games in the current process for a book.
+    
+    Returns:
+        list: A (cells, winner) pair per game, as taken by OpeningBook.add_game
+    """
+    from simulate import play_game
+    from strategies import close_player, create_player
+    
+    rng = random.Random(seed)
+    player1 = create_player(x_strategy, 'X', seed=rng.getrandbits(32))
+    player2 = create_player(o_strategy, 'O', seed=rng.getrandbits(32))
+    results = []
+    try:
+        for _ in range(games):
+            game = play_game(player1, player2, board_size, win_length)
+            winner = None
+            if game.winner is not None:
+                winner = 0 if game.winner is player1 else 1
+            results.append((game.history.cells, winner))
+    finally:
+        close_player(player1)
+        close_player(player2)
+    return results
+
+def add_self_play(book, games, x_strategy, o_strategy, workers=None, seed=None):
+    """
+    Play games between two strategies and add their openings to a book.
+    
+    Games are split into one batch per worker process, as in simulate().
+    
+    Returns:
+        int: The number of games added
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, games))
+    rng = random.Random(seed)
+    shards = [games // workers + (1 if i < games % workers else 0) for i in range(workers)]
+    jobs = [(x_strategy, o_strategy, count, book.board_size, book.win_length, rng.getrandbits(32))
+            for count in shards if count]
+    
+    if workers == 1:
+        batches = [play_book_games(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(play_book_games, *zip(*jobs)))
+    
+    added = 0
+    for batch in batches:
+        for cells, winner in batch:
+            added += book.add_game(cells, winner)
+    return added
+
+def add_structured_log(book, path):
+    """
+    Add the openings of the games in a StructuredGameLogger log to a book.
+    
+    Games logged without their moves or on another board size are skipped.
+    The log is opened read-only, so a missing log raises FileNotFoundError.
+    
+    Returns:
+        int: The number of games added
+    """
+    added = 0
+    with StructuredGameLogger(path, read_only=True) as log:
+        for start in range(0, log.count, 4096):
+            for record in log.get_records(start, start + 4096):
+                added += book.add_record(record)
+    return added
+
+def main(argv=None):
+    """Parse the command line and build or extend an opening book."""
+    parser = argparse.ArgumentParser(description="Build an opening book from recorded games.")
+    parser.add_argument("--output", default=DEFAULT_OPENING_BOOK_FILE,
+                        help="the book file, extended if it already exists")
+    parser.add_argument("--log", action="append", default=[],
+                        help="a structured game log to mine (can be given more than once)")
+    parser.add_argument("--self-play", type=int, default=0, metavar="GAMES",
+                        help="play this many games to mine")
+    parser.add_argument("--x-strategy", default="mcts", help="strategy playing X in self-play")
+    parser.add_argument("--o-strategy", default="mcts", help="strategy playing O in self-play")
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--win-length", type=int, default=None,
+                        help="marks in a row needed to win (defaults to the board size)")
+    parser.add_argument("--max-ply", type=int, default=8, help="moves of each game to record")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for self-play (defaults to the number of CPUs)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    args = parser.parse_args(argv)
+    
+    if not args.log and not args.self_play:
+        parser.error("give at least one --log or --self-play")
+    
+    if os.path.exists(args.output):
+        try:
+            book = OpeningBook.load(args.output)
+        except ValueError as e:
+            parser.error(str(e))
+        if (book.board_size, book.win_length) != (args.size, args.win_length or args.size):
+            parser.error(f"{args.output} is a book for another board")
+    else:
+        book = OpeningBook(args.size, args.win_length, args.max_ply)
+    
+    for path in args.log:
+        try:
+            added = add_structured_log(book, path)
+        except FileNotFoundError as e:
+            parser.error(f"can't read the log {path}: {e}")
+        print(f"Added {added} games from {path}")
+    if args.self_play:
+        added = add_self_play(book, args.self_play, args.x_strategy, args.o_strategy,
+                              args.workers, args.seed)
+        print(f"Added {added} self-play games")
+    
+    if book.save(args.output):
+        print(f"Wrote {book.positions} positions to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -18,5 +18,10 @@ class Player:
     def name(self):
         return self._name
     
+    @property
+    def is_computer(self):
+        """Whether the player chooses its own moves with choose_move(board)."""
+        return False
+    
     def __str__(self):
         return f"{self._name} ({self._symbol})"
\ No newline at end of file
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+
+class TextCache:
+    """
+    A least-recently-used cache of rendered text surfaces.
+    
+    Rendering text is one of the slowest things a frame does, and most of
+    the text on screen - titles, button captions, hints - is the same every
+    frame. Surfaces are keyed by the font, text, antialiasing and color, so
+    the same font object always gives back the same surface for the same
+    text. The font object stands for its face and size.
+    """
+    def __init__(self, max_size=256):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self._max_size = max_size
+        self._surfaces = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+    
+    def __len__(self):
+        return len(self._surfaces)
+    
+    @property
+    def max_size(self):
+        return self._max_size
+    
+    @property
+    def hits(self):
+        return self._hits
+    
+    @property
+    def misses(self):
+        return self._misses
+    
+    def render(self, font, text, color, antialias=True):
+        """
+        Render text, reusing the surface from an earlier call if there is one.
+        
+        Args:
+            font (pygame.font.Font): The font to render with
+            text (str): The text to render
+            color (tuple): The RGB color of the text
+            antialias (bool): Whether to antialias the text
+        
+        Returns:
+            pygame.Surface: The rendered text, which must not be drawn on
+        """
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self._hits += 1
+            return surface
+        
+        self._misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self._max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        """Drop every cached surface."""
+        self._surfaces.clear()
+
+# The cache shared by the UI components
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the shared text cache."""
+    return text_cache.render(font, text, color, antialias)
\ No newline at end of file
@@ -0,0 +1,550 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+from game import TicTacToeGame
+from game_logger import BufferedGameLogger
+from player import Player
+
+# Largest board a client may ask for
+MAX_BOARD_SIZE = 19
+
+# Longest message a client may send, in bytes
+MAX_LINE_LENGTH = 4096
+
+def encode_message(message):
+    """Encode a message as a line of JSON."""
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+class _Session:
+    """
+    A connected client.
+    
+    Attributes:
+        writer (asyncio.StreamWriter): The connection to the client
+        name (str or None): The player name given when joining
+        match (_Match or None): The match being played, if any
+        symbol (str or None): The symbol played in the match
+        queue_key (tuple or None): The matchmaking queue the client is waiting in
+    """
+    __slots__ = ("writer", "name", "match", "symbol", "queue_key")
+    
+    def __init__(self, writer):
+        self.writer = writer
+        self.name = None
+        self.match = None
+        self.symbol = None
+        self.queue_key = None
+    
+    def send(self, message):
+        """Queue a message for the client without waiting for it to be sent."""
+        if not self.writer.is_closing():
+            self.writer.write(encode_message(message))
+
+class _Match:
+    """
+    A game between two sessions.
+    
+    Attributes:
+        id (int): The match number
+        game (TicTacToeGame): The game being played
+        sessions (tuple): The sessions playing X and O
+        timer (asyncio.TimerHandle or None): Forfeits the game if the player
+                                             to move takes too long
+        finished (bool): Whether a result has been sent and logged
+    """
+    __slots__ = ("id", "game", "sessions", "timer", "finished")
+    
+    def __init__(self, match_id, game, sessions):
+        self.id = match_id
+        self.game = game
+        self.sessions = sessions
+        self.timer = None
+        self.finished = False
+    
+    def broadcast(self, message):
+        for session in self.sessions:
+            session.send(message)
+    
+    def opponent(self, session):
+        return self.sessions[1] if session is self.sessions[0] else self.sessions[0]
+
+class GameServer:
+    """
+    Hosts many concurrent tic-tac-toe games over line-delimited JSON.
+    
+    Every message is one JSON object per line with a "type" field. Clients
+    send:
+        {"type": "join", "name": str, "size": int, "win_length": int}
+            - wait for an opponent who asked for the same board; size and
+              win_length are optional
+        {"type": "move", "row": int, "col": int}
+        {"type": "resign"}
+    
+    and the server replies with:
+        {"type": "waiting"}
+        {"type": "start", "game": int, "symbol": str, "opponent": str,
+         "size": int, "win_length": int, "move_timeout": float}
+        {"type": "moved", "symbol": str, "row": int, "col": int}
+        {"type": "over", "winner": str or None, "winner_symbol": str or None,
+         "reason": str}
+            - winner is the winner's name and winner_symbol is "X" or "O",
+              which tells the players apart when they share a name; both
+              are null if nobody won
+            - reason is "win", "draw", "timeout", "resign", "disconnect" or
+              "shutdown"
+        {"type": "error", "message": str}
+    
+    A player who doesn't move within move_timeout seconds, resigns or
+    disconnects forfeits the game. Each game runs on a TicTacToeGame, so
+    finished games are logged through its logger; forfeits are logged
+    through the same logger. Games still being played when the server
+    closes end without a result and aren't logged. After a game ends, a
+    client may join again.
+    
+    All games share one event loop and nothing blocks it: moves are checked
+    in memory, replies are written without waiting for the socket, and the
+    default BufferedGameLogger writes from its own thread.
+    """
+    def __init__(self, logger=None, move_timeout=30.0):
+        self._logger = logger or BufferedGameLogger()
+        self._move_timeout = move_timeout
+        self._waiting = {}
+        self._matches = {}
+        self._next_match_id = 1
+        self._servers = []
+        self._connections = {}
+        self._games_finished = 0
+    
+    @property
+    def active_games(self):
+        return len(self._matches)
+    
+    @property
+    def games_finished(self):
+        return self._games_finished
+    
+    @property
+    def waiting_players(self):
+        return sum(len(queue) for queue in self._waiting.values())
+    
+    async def start(self, host="127.0.0.1", port=8765):
+        """
+        Start listening for TCP connections.
+        
+        Returns:
+            tuple: The (host, port) being listened on, which gives the port
+                   chosen by the system if port was 0
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port,
+                                            limit=MAX_LINE_LENGTH, backlog=1024)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+    
+    async def start_unix(self, path):
+        """Start listening for connections on a Unix socket."""
+        server = await asyncio.start_unix_server(self._handle_connection, path,
+                                                 limit=MAX_LINE_LENGTH, backlog=1024)
+        self._servers.append(server)
+        return path
+    
+    async def serve_forever(self):
+        """Serve connections until the task is cancelled."""
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+    
+    async def close(self):
+        """Stop listening, disconnect every client and wait for them to be handled."""
+        for server in self._servers:
+            server.close()
+        # End unfinished games first, so disconnecting their players doesn't
+        # log a forfeit for them
+        for match in list(self._matches.values()):
+            self._finish(match, None, "shutdown")
+        for writer in self._connections.values():
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+    
+    async def _handle_connection(self, reader, writer):
+        """Read and handle messages from one client until it disconnects."""
+        session = _Session(writer)
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    session.send({"type": "error", "message": "Message too long"})
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    session.send({"type": "error", "message": "Invalid JSON"})
+                    continue
+                if not isinstance(message, dict):
+                    session.send({"type": "error", "message": "Expected a JSON object"})
+                    continue
+                
+                self._handle_message(session, message)
+                
+                # Stop reading from clients that don't read their replies
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+        finally:
+            del self._connections[task]
+            self._disconnect(session)
+            writer.close()
+    
+    def _handle_message(self, session, message):
+        """Dispatch a message from a client."""
+        kind = message.get("type")
+        if kind == "join":
+            self._join(session, message)
+        elif kind == "move":
+            self._move(session, message)
+        elif kind == "resign":
+            if session.match is None:
+                session.send({"type": "error", "message": "Not in a game"})
+            else:
+                match = session.match
+                self._forfeit(match, match.opponent(session), "resign")
+        else:
+            session.send({"type": "error", "message": f"Unknown message type {kind!r}"})
+    
+    def _join(self, session, message):
+        """Put a client in the matchmaking queue, or start a game if someone is waiting."""
+        if session.match is not None or session.queue_key is not None:
+            session.send({"type": "error", "message": "Already playing or waiting"})
+            return
+        
+        size = message.get("size", 3)
+        win_length = message.get("win_length", size)
+        if (not isinstance(size, int) or not isinstance(win_length, int)
+                or not 1 <= size <= MAX_BOARD_SIZE or not 1 <= win_length <= size):
+            session.send({"type": "error", "message": "Invalid board size or win length"})
+            return
+        
+        name = message.get("name")
+        session.name = str(name)[:32] if name else None
+        
+        key = (size, win_length)
+        queue = self._waiting.setdefault(key, deque())
+        if not queue:
+            session.queue_key = key
+            queue.append(session)
+            session.send({"type": "waiting"})
+            return
+        
+        opponent = queue.popleft()
+        if not queue:
+            del self._waiting[key]
+        opponent.queue_key = None
+        self._start_match((opponent, session), size, win_length)
+    
+    def _start_match(self, sessions, size, win_length):
+        """Start a game between two sessions, the first playing X."""
+        players = [Player(symbol, session.name) for symbol, session in zip(("X", "O"), sessions)]
+        game = TicTacToeGame(board_size=size, win_length=win_length, logger=self._logger,
+                             players=players)
+        match = _Match(self._next_match_id, game, sessions)
+        self._next_match_id += 1
+        self._matches[match.id] = match
+        
+        for session, player, opponent in zip(sessions, players, reversed(players)):
+            session.match = match
+            session.symbol = player.symbol
+            session.send({
+                "type": "start",
+                "game": match.id,
+                "symbol": player.symbol,
+                "opponent": opponent.name,
+                "size": size,
+                "win_length": win_length,
+                "move_timeout": self._move_timeout
+            })
+        self._start_timer(match)
+    
+    def _move(self, session, message):
+        """Make a client's move in its game."""
+        match = session.match
+        if match is None:
+            session.send({"type": "error", "message": "Not in a game"})
+            return
+        game = match.game
+        if game.current_player.symbol != session.symbol:
+            session.send({"type": "error", "message": "Not your turn"})
+            return
+        
+        row, col = message.get("row"), message.get("col")
+        size = game.board.size
+        if (not isinstance(row, int) or not isinstance(col, int)
+                or not 0 <= row < size or not 0 <= col < size
+                or not game.make_move(row, col)):
+            session.send({"type": "error", "message": "Invalid move"})
+            return
+        
+        match.broadcast({"type": "moved", "symbol": session.symbol, "row": row, "col": col})
+        if game.is_game_over:
+            # The game has logged its own result
+            self._finish(match, game.winner, "win" if game.winner else "draw")
+        else:
+            self._start_timer(match)
+    
+    def _start_timer(self, match):
+        """Give the player to move move_timeout seconds before they forfeit."""
+        if match.timer is not None:
+            match.timer.cancel()
+        if self._move_timeout:
+            match.timer = asyncio.get_running_loop().call_later(
+                self._move_timeout, self._timeout, match
+            )
+    
+    def _timeout(self, match):
+        """Forfeit the game of the player who ran out of time."""
+        match.timer = None
+        if not match.finished:
+            mover = match.sessions[0 if match.game.current_player.symbol == "X" else 1]
+            self._forfeit(match, match.opponent(mover), "timeout")
+    
+    def _forfeit(self, match, winner_session, reason):
+        """End a game that wasn't played out and log it as a win for winner_session."""
+        players = match.game.players
+        winner = players[match.sessions.index(winner_session)]
+        self._logger.log_result(players[0], players[1], winner, history=match.game.history)
+        self._finish(match, winner, reason)
+    
+    def _finish(self, match, winner, reason):
+        """Tell both players the result, winner being a Player or None, and free them."""
+        if match.timer is not None:
+            match.timer.cancel()
+            match.timer = None
+        match.finished = True
+        match.broadcast({
+            "type": "over",
+            "winner": winner.name if winner else None,
+            "winner_symbol": winner.symbol if winner else None,
+            "reason": reason
+        })
+        for session in match.sessions:
+            session.match = None
+            session.symbol = None
+        del self._matches[match.id]
+        self._games_finished += 1
+    
+    def _disconnect(self, session):
+        """Remove a client from matchmaking and forfeit its game."""
+        if session.queue_key is not None:
+            queue = self._waiting.get(session.queue_key)
+            if queue is not None:
+                queue.remove(session)
+                if not queue:
+                    del self._waiting[session.queue_key]
+            session.queue_key = None
+        if session.match is not None:
+            match = session.match
+            self._forfeit(match, match.opponent(session), "disconnect")
+
+class GameClient:
+    """
+    A client for GameServer, for tests, bots and load testing.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+    
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        """Connect to a server over TCP."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+    
+    @classmethod
+    async def connect_unix(cls, path):
+        """Connect to a server on a Unix socket."""
+        reader, writer = await asyncio.open_unix_connection(path)
+        return cls(reader, writer)
+    
+    async def send(self, message):
+        """Send a message to the server."""
+        self._writer.write(encode_message(message))
+        await self._writer.drain()
+    
+    async def receive(self):
+        """
+        Wait for the next message from the server.
+        
+        Returns:
+            dict or None: The message, or None if the server closed the connection
+        """
+        line = await self._reader.readline()
+        return json.loads(line) if line else None
+    
+    async def join(self, name=None, size=3, win_length=None):
+        """Ask to be matched with an opponent."""
+        message = {"type": "join", "name": name, "size": size}
+        if win_length is not None:
+            message["win_length"] = win_length
+        await self.send(message)
+    
+    async def move(self, row, col):
+        """Send a move."""
+        await self.send({"type": "move", "row": row, "col": col})
+    
+    async def resign(self):
+        """Resign the current game."""
+        await self.send({"type": "resign"})
+    
+    async def close(self):
+        """Close the connection."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+    
+    async def play_random(self, name=None, size=3, seed=None):
+        """
+        Join a game and play random moves until it ends.
+        
+        Returns:
+            tuple: The symbol played and the "over" message that ended the game
+        """
+        rng = random.Random(seed)
+        await self.join(name, size)
+        free = None
+        symbol = None
+        while True:
+            message = await self.receive()
+            if message is None:
+                raise ConnectionError("Server closed the connection")
+            kind = message["type"]
+            if kind == "start":
+                symbol = message["symbol"]
+                free = {(row, col) for row in range(size) for col in range(size)}
+                if symbol == "X":
+                    await self._random_move(free, rng)
+            elif kind == "moved":
+                free.discard((message["row"], message["col"]))
+                if message["symbol"] != symbol:
+                    await self._random_move(free, rng)
+            elif kind == "over":
+                return symbol, message
+            elif kind == "error":
+                raise RuntimeError(message["message"])
+    
+    async def _random_move(self, free, rng):
+        if free:
+            await self.move(*rng.choice(sorted(free)))
+
+async def self_play(games, size=3, move_timeout=30.0, logger=None, seed=None):
+    """
+    Start a server in this process and play games on it between random clients.
+    
+    Every client connects before any game starts, so all the games are in
+    progress at the same time.
+    
+    Args:
+        games (int): The number of concurrent games
+        size (int): The size of the board
+        move_timeout (float): Seconds each player has per move
+        logger (GameLogger or None): Where the server logs results
+        seed (int or None): The seed for the clients' random moves
+    
+    Returns:
+        dict: Counts of 'x_wins', 'o_wins', 'draws' and 'forfeits', plus
+              'games', 'elapsed' and 'games_per_second'
+    """
+    server = GameServer(logger, move_timeout)
+    host, port = await server.start("127.0.0.1", 0)
+    rng = random.Random(seed)
+    try:
+        clients = await asyncio.gather(*(GameClient.connect(host, port) for _ in range(2 * games)))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            client.play_random(f"Client {i}", size, rng.getrandbits(32))
+            for i, client in enumerate(clients)
+        ))
+        elapsed = time.perf_counter() - start
+        await asyncio.gather(*(client.close() for client in clients))
+    finally:
+        await server.close()
+    
+    # Both clients of a game receive the same result, so count X's copy
+    totals = {"x_wins": 0, "o_wins": 0, "draws": 0, "forfeits": 0}
+    for symbol, result in results:
+        if symbol != "X":
+            continue
+        if result["reason"] in ("timeout", "resign", "disconnect"):
+            totals["forfeits"] += 1
+        elif result["winner_symbol"] is None:
+            totals["draws"] += 1
+        elif result["winner_symbol"] == "X":
+            totals["x_wins"] += 1
+        else:
+            totals["o_wins"] += 1
+    totals["games"] = games
+    totals["elapsed"] = elapsed
+    totals["games_per_second"] = games / elapsed if elapsed > 0 else float("inf")
+    return totals
+
+async def _serve(args):
+    """Run the server until interrupted."""
+    logger = BufferedGameLogger(args.log_file)
+    server = GameServer(logger, args.move_timeout)
+    try:
+        if args.unix:
+            await server.start_unix(args.unix)
+            print(f"Listening on {args.unix}")
+        else:
+            host, port = await server.start(args.host, args.port)
+            print(f"Listening on {host}:{port}")
+        await server.serve_forever()
+    finally:
+        await server.close()
+        logger.close()
+
+def main(argv=None):
+    """Parse the command line and run the server."""
+    parser = argparse.ArgumentParser(description="Host tic-tac-toe games over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--move-timeout", type=float, default=30.0,
+                        help="seconds a player has to move before forfeiting (0 for no limit)")
+    parser.add_argument("--log-file", default="game_log.txt", help="file to log results to")
+    parser.add_argument("--self-play", type=int, default=None, metavar="GAMES",
+                        help="play this many concurrent games between random local clients "
+                             "instead of serving")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for --self-play")
+    args = parser.parse_args(argv)
+    
+    if args.self_play is not None:
+        if args.self_play < 1:
+            parser.error("--self-play must be at least 1")
+        with BufferedGameLogger(args.log_file) as logger:
+            results = asyncio.run(self_play(args.self_play, move_timeout=args.move_timeout,
+                                            logger=logger, seed=args.seed))
+        print(f"Played {results['games']} concurrent games in {results['elapsed']:.2f}s "
+              f"({results['games_per_second']:.1f} games/s)")
+        print(f"X wins: {results['x_wins']}, O wins: {results['o_wins']}, "
+              f"draws: {results['draws']}, forfeits: {results['forfeits']}")
+        return
+    
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
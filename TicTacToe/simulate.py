@@ -0,0 +1,162 @@
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game import TicTacToeGame
+from game_logger import GameLogger, NullLogger
+from strategies import available_strategies, close_player, create_player
+
+def play_game(player1, player2, board_size=3, win_length=None, logger=None):
+    """
+    Play one game between two computer players.
+    
+    Args:
+        player1 (Player): The player who plays X
+        player2 (Player): The player who plays O
+        board_size (int): The size of the board
+        win_length (int): The number of marks in a row needed to win
+        logger (GameLogger): Where to log the result (discarded by default)
+    
+    Returns:
+        TicTacToeGame: The finished game
+    """
+    game = TicTacToeGame(board_size=board_size, win_length=win_length,
+                         logger=logger or NullLogger(), players=[player1, player2])
+    while not game.is_game_over:
+        if not game.make_computer_move():
+            raise RuntimeError(f"{game.current_player} did not make a valid move")
+    return game
+
+def run_shard(x_strategy, o_strategy, games, board_size=3, win_length=None, seed=None,
+              log_file=None):
+    """
+    Play a batch of games in the current process.
+    
+    Args:
+        x_strategy (str): The strategy that plays X
+        o_strategy (str): The strategy that plays O
+        games (int): The number of games to play
+        board_size (int): The size of the board
+        win_length (int): The number of marks in a row needed to win
+        seed (int or None): The seed for the players' random choices
+        log_file (str or None): A file to log results to
+    
+    Returns:
+        dict: Counts of 'x_wins', 'o_wins' and 'draws' and a 'lengths' map
+              from the number of moves to the number of games
+    """
+    rng = random.Random(seed)
+    player1 = create_player(x_strategy, 'X', seed=rng.getrandbits(32))
+    player2 = create_player(o_strategy, 'O', seed=rng.getrandbits(32))
+    logger = GameLogger(log_file) if log_file else NullLogger()
+    
+    x_wins = o_wins = draws = 0
+    lengths = Counter()
+    try:
+        for _ in range(games):
+            game = play_game(player1, player2, board_size, win_length, logger)
+            if game.winner is player1:
+                x_wins += 1
+            elif game.winner is player2:
+                o_wins += 1
+            else:
+                draws += 1
+            lengths[len(game.history)] += 1
+    finally:
+        close_player(player1)
+        close_player(player2)
+    
+    return {"x_wins": x_wins, "o_wins": o_wins, "draws": draws, "lengths": dict(lengths)}
+
+def simulate(games, x_strategy, o_strategy, board_size=3, win_length=None, workers=None,
+             seed=None, log_file=None):
+    """
+    Play games between two strategies, sharded across worker processes.
+    
+    Args:
+        games (int): The number of games to play
+        x_strategy (str): The strategy that plays X
+        o_strategy (str): The strategy that plays O
+        board_size (int): The size of the board
+        win_length (int): The number of marks in a row needed to win
+        workers (int or None): The number of worker processes (defaults to
+                               the number of CPUs, 1 plays in this process)
+        seed (int or None): The seed for the players' random choices
+        log_file (str or None): A file to log results to
+    
+    Returns:
+        dict: The combined counts from run_shard() plus 'games', 'elapsed'
+              and 'games_per_second'
+    """
+    workers = max(1, min(workers if workers else os.cpu_count() or 1, games))
+    rng = random.Random(seed)
+    shards = [games // workers + (1 if i < games % workers else 0) for i in range(workers)]
+    jobs = [(x_strategy, o_strategy, count, board_size, win_length, rng.getrandbits(32), log_file)
+            for count in shards]
+    
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_shard(*jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_shard, *zip(*jobs)))
+    elapsed = time.perf_counter() - start
+    
+    totals = {"x_wins": 0, "o_wins": 0, "draws": 0, "lengths": Counter()}
+    for result in results:
+        for key in ("x_wins", "o_wins", "draws"):
+            totals[key] += result[key]
+        totals["lengths"].update(result["lengths"])
+    totals["lengths"] = dict(sorted(totals["lengths"].items()))
+    totals["games"] = games
+    totals["elapsed"] = elapsed
+    totals["games_per_second"] = games / elapsed if elapsed > 0 else float("inf")
+    return totals
+
+def format_report(results, x_strategy, o_strategy):
+    """Format the results of simulate() as a human-readable report."""
+    games = results["games"]
+    lines = [
+        f"Played {games} games in {results['elapsed']:.2f}s "
+        f"({results['games_per_second']:.1f} games/s)",
+        f"X ({x_strategy}) wins: {results['x_wins']} ({results['x_wins'] / games:.1%})",
+        f"O ({o_strategy}) wins: {results['o_wins']} ({results['o_wins'] / games:.1%})",
+        f"Draws: {results['draws']} ({results['draws'] / games:.1%})",
+        "Game length distribution:"
+    ]
+    for length, count in results["lengths"].items():
+        lines.append(f"  {length:3d} moves: {count:7d} ({count / games:.1%})")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Parse the command line and run the simulation."""
+    strategies = available_strategies()
+    parser = argparse.ArgumentParser(
+        description="Play tic-tac-toe games between computer strategies without a display."
+    )
+    parser.add_argument("--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("--x", dest="x_strategy", choices=strategies, default="random",
+                        help="strategy that plays X")
+    parser.add_argument("--o", dest="o_strategy", choices=strategies, default="random",
+                        help="strategy that plays O")
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--win-length", type=int, default=None,
+                        help="marks in a row needed to win (defaults to the board size)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (defaults to the number of CPUs)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--log-file", default=None, help="log every result to this file")
+    args = parser.parse_args(argv)
+    
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    
+    results = simulate(args.games, args.x_strategy, args.o_strategy, args.size,
+                       args.win_length, args.workers, args.seed, args.log_file)
+    print(format_report(results, args.x_strategy, args.o_strategy))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import random
+
+from computer_player import ComputerPlayer
+from mcts_player import MCTSPlayer
+from player import Player
+
+class RandomPlayer(Player):
+    """
+    A computer player that picks a random empty square.
+    """
+    def __init__(self, symbol, name=None, seed=None):
+        super().__init__(symbol, name)
+        self._rng = random.Random(seed)
+    
+    @property
+    def is_computer(self):
+        return True
+    
+    def choose_move(self, board):
+        """Choose a random empty square, or None if the game is over."""
+        if board.get_winner() is not None:
+            return None
+        moves = board.available_moves()
+        return self._rng.choice(moves) if moves else None
+
+# Registered strategies, mapping a name to a factory(symbol, name, seed)
+_STRATEGIES = {}
+
+def register_strategy(strategy, factory):
+    """
+    Register a player strategy by name.
+    
+    Args:
+        strategy (str): The name of the strategy
+        factory (callable): A function taking (symbol, name, seed) and returning a Player
+    """
+    _STRATEGIES[strategy] = factory
+
+def available_strategies():
+    """Get the names of the registered strategies."""
+    return sorted(_STRATEGIES)
+
+def create_player(strategy, symbol, name=None, seed=None):
+    """
+    Create a player for a registered strategy.
+    
+    Args:
+        strategy (str): The name of the strategy
+        symbol (str): The player's symbol ('X' or 'O')
+        name (str): The player's name (defaults to the strategy name)
+        seed (int or None): A seed for strategies that make random choices
+    
+    Returns:
+        Player: The new player
+    """
+    if strategy not in _STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of "
+                         f"{', '.join(available_strategies())}")
+    return _STRATEGIES[strategy](symbol, name if name else strategy, seed)
+
+def close_player(player):
+    """Release any resources, such as worker processes, held by a player."""
+    close = getattr(player, "close", None)
+    if close is not None:
+        close()
+
+register_strategy("random", lambda symbol, name, seed: RandomPlayer(symbol, name, seed=seed))
+register_strategy("minimax", lambda symbol, name, seed: ComputerPlayer(
+    symbol, name, time_limit=0.1))
+register_strategy("mcts", lambda symbol, name, seed: MCTSPlayer(
+    symbol, name, iterations=500, time_limit=None, workers=1, seed=seed))
\ No newline at end of file
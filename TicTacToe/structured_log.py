@@ -0,0 +1,251 @@
+import bisect
+import os
+import struct
+import time
+from array import array
+from collections import namedtuple
+
+# result is the stored result code: DRAW, PLAYER1_WON or PLAYER2_WON. It tells
+# who won even when both players have the same name.
+GameRecord = namedtuple(
+    "GameRecord", ["timestamp", "player1", "player2", "winner", "move_count", "moves", "result"]
+)
+
+class StructuredGameLogger:
+    """
+    Logs game results as fixed-size binary records with a player index.
+    
+    The log is made of four files sharing a base path:
+        <path>        - one 32-byte record per game: timestamp, player IDs,
+                        result, move count and the offset of its moves
+        <path>.names  - interned player names, one per line; a name's ID is
+                        its line number
+        <path>.moves  - the (row, col) bytes of every recorded move
+        <path>.idx    - (player ID, record number) pairs, two per game
+    
+    Because records have a fixed size, record n is read with a single seek.
+    The index lets queries by player jump straight to that player's records,
+    and records are appended in time order so time-range queries use a
+    binary search instead of scanning the file.
+    
+    It can be used as the logger= argument of TicTacToeGame; the game passes
+    its history so the full move list is stored. With read_only set, an
+    existing log is opened for reading only: nothing is created, a missing
+    file raises FileNotFoundError and log_result raises ValueError.
+    """
+    RECORD = struct.Struct("<dIIBHQ5x")
+    INDEX_ENTRY = struct.Struct("<II")
+    
+    # Results stored in a record
+    DRAW = 0
+    PLAYER1_WON = 1
+    PLAYER2_WON = 2
+    
+    _NO_MOVES = 0xFFFFFFFFFFFFFFFF
+    
+    def __init__(self, path="game_log.bin", record_moves=True, read_only=False):
+        self._path = path
+        self._record_moves = record_moves
+        self._read_only = read_only
+        binary_mode, text_mode = ("rb", "r") if read_only else ("a+b", "a+")
+        files = []
+        try:
+            for suffix, mode in (("", binary_mode), (".names", text_mode),
+                                 (".moves", binary_mode), (".idx", binary_mode)):
+                if "b" in mode:
+                    files.append(open(path + suffix, mode))
+                else:
+                    # Only "\n" ends a name, so any other character reads back as written
+                    files.append(open(path + suffix, mode, encoding="utf-8", newline="\n"))
+        except OSError:
+            for f in files:
+                f.close()
+            raise
+        self._records, self._names_file, self._moves, self._index_file = files
+        
+        # Drop a partly written record left behind by a crash, so the next
+        # record is appended where it belongs
+        self._count = os.path.getsize(path) // self.RECORD.size
+        if not read_only:
+            self._records.truncate(self._count * self.RECORD.size)
+        
+        self._names_file.seek(0)
+        self._names = [line.rstrip("\r\n") for line in self._names_file]
+        self._name_ids = {name: index for index, name in enumerate(self._names)}
+        
+        # Index entries are written after their record, in record order, so
+        # only a partly written entry or the entries of a dropped record can
+        # follow the last good one
+        self._index = {}
+        self._index_file.seek(0)
+        data = self._index_file.read()
+        entries = 0
+        for player_id, record in self.INDEX_ENTRY.iter_unpack(
+                data[:len(data) - len(data) % self.INDEX_ENTRY.size]):
+            if record >= self._count:
+                break
+            self._index.setdefault(player_id, array("I")).append(record)
+            entries += 1
+        if not read_only:
+            self._index_file.truncate(entries * self.INDEX_ENTRY.size)
+    
+    @property
+    def count(self):
+        """The number of games in the log."""
+        return self._count
+    
+    def log_result(self, player1, player2, winner=None, history=None):
+        """
+        Log the result of a game.
+        
+        Args:
+            player1 (Player): The first player
+            player2 (Player): The second player
+            winner (Player or None): The winning player, or None if it's a draw
+            history (GameHistory or None): The game's moves, if available
+        
+        Returns:
+            bool: True if the result was logged successfully, False otherwise
+        """
+        if self._read_only:
+            raise ValueError(f"{self._path} was opened read-only")
+        try:
+            if winner is None:
+                result = self.DRAW
+            elif winner is player1:
+                result = self.PLAYER1_WON
+            else:
+                result = self.PLAYER2_WON
+            
+            move_count = 0
+            offset = self._NO_MOVES
+            if history is not None:
+                move_count = len(history)
+                if self._record_moves:
+                    self._moves.seek(0, os.SEEK_END)
+                    offset = self._moves.tell()
+                    data = array("B")
+                    for _, (row, col) in history:
+                        data.append(row)
+                        data.append(col)
+                    self._moves.write(data.tobytes())
+                    self._moves.flush()
+            
+            ids = (self._intern(player1.name), self._intern(player2.name))
+            record = self._count
+            self._records.write(self.RECORD.pack(time.time(), ids[0], ids[1], result,
+                                                 move_count, offset))
+            self._records.flush()
+            self._count += 1
+            
+            for player_id in set(ids):
+                self._index_file.write(self.INDEX_ENTRY.pack(player_id, record))
+                self._index.setdefault(player_id, array("I")).append(record)
+            self._index_file.flush()
+            return True
+        except Exception as e:
+            print(f"Error writing to log file: {e}")
+            return False
+    
+    def _intern(self, name):
+        """Get the ID of a player name, adding it to the names file if it's new."""
+        # Names are stored one per line
+        name = name.replace("\r", " ").replace("\n", " ")
+        player_id = self._name_ids.get(name)
+        if player_id is None:
+            player_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = player_id
+            self._names_file.write(name + "\n")
+            self._names_file.flush()
+        return player_id
+    
+    def get_record(self, number):
+        """
+        Read a single game record.
+        
+        Args:
+            number (int): The record number, counting from 0
+        
+        Returns:
+            GameRecord: The game record
+        """
+        if not 0 <= number < self._count:
+            raise IndexError(f"record {number} out of range")
+        self._records.seek(number * self.RECORD.size)
+        return self._decode(self._records.read(self.RECORD.size))
+    
+    def get_records(self, start=0, stop=None):
+        """Read the records numbered start up to stop with a single read."""
+        stop = self._count if stop is None else min(stop, self._count)
+        if start >= stop:
+            return []
+        self._records.seek(start * self.RECORD.size)
+        data = self._records.read((stop - start) * self.RECORD.size)
+        return [self._decode(data[i:i + self.RECORD.size])
+                for i in range(0, len(data), self.RECORD.size)]
+    
+    def games_by_player(self, name):
+        """Get the records of every game the named player took part in, oldest first."""
+        player_id = self._name_ids.get(name)
+        if player_id is None:
+            return []
+        return [self.get_record(number) for number in self._index.get(player_id, ())]
+    
+    def games_between(self, start, end):
+        """
+        Get the records of the games logged in a time range.
+        
+        Args:
+            start (float): The start of the range as a Unix timestamp (inclusive)
+            end (float): The end of the range as a Unix timestamp (exclusive)
+        
+        Returns:
+            list: The GameRecords in the range, oldest first
+        """
+        timestamps = _TimestampView(self)
+        first = bisect.bisect_left(timestamps, start)
+        last = bisect.bisect_left(timestamps, end, lo=first)
+        return self.get_records(first, last)
+    
+    def _timestamp(self, number):
+        self._records.seek(number * self.RECORD.size)
+        return struct.unpack("<d", self._records.read(8))[0]
+    
+    def _decode(self, data):
+        timestamp, id1, id2, result, move_count, offset = self.RECORD.unpack(data)
+        player1, player2 = self._names[id1], self._names[id2]
+        winner = None
+        if result == self.PLAYER1_WON:
+            winner = player1
+        elif result == self.PLAYER2_WON:
+            winner = player2
+        
+        moves = None
+        if offset != self._NO_MOVES:
+            self._moves.seek(offset)
+            data = self._moves.read(2 * move_count)
+            moves = [(data[i], data[i + 1]) for i in range(0, len(data), 2)]
+        return GameRecord(timestamp, player1, player2, winner, move_count, moves, result)
+    
+    def close(self):
+        """Close the log files."""
+        for f in (self._records, self._names_file, self._moves, self._index_file):
+            f.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class _TimestampView:
+    """A read-only sequence of record timestamps for bisect, read on demand."""
+    def __init__(self, log):
+        self._log = log
+    
+    def __len__(self):
+        return self._log.count
+    
+    def __getitem__(self, number):
+        return self._log._timestamp(number)
\ No newline at end of file
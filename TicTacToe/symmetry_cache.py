@@ -0,0 +1,107 @@
+import functools
+from collections import OrderedDict
+
+class CanonicalCache:
+    """
+    A least-recently-used cache of values for board positions, shared by
+    every rotation and reflection of a position.
+    
+    Entries are keyed by the board's size, win length and canonical hash,
+    plus an optional extra key such as the player to move, so a value stored
+    for one board is found again for any of its eight symmetric versions.
+    Only values that don't change under a symmetry, such as scores, should
+    be stored; a move has to be mapped through the board's
+    canonical_symmetry before it can be shared.
+    """
+    def __init__(self, max_size=100000):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+    
+    @property
+    def max_size(self):
+        return self._max_size
+    
+    @property
+    def size(self):
+        """The number of cached positions."""
+        return len(self._entries)
+    
+    @property
+    def hits(self):
+        return self._hits
+    
+    @property
+    def misses(self):
+        return self._misses
+    
+    @staticmethod
+    def key(board, extra=None):
+        """Get the key a board is cached under."""
+        return (board.size, board.win_length, board.canonical_hash, extra)
+    
+    def get(self, board, default=None, extra=None):
+        """
+        Look up the value cached for a board or any of its symmetries.
+        
+        Args:
+            board (Board): The board to look up
+            default: The value to return if nothing is cached
+            extra: The extra key the value was stored with
+        
+        Returns:
+            The cached value, or default
+        """
+        key = self.key(board, extra)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key]
+        self._misses += 1
+        return default
+    
+    def put(self, board, value, extra=None):
+        """Cache a value for a board, evicting the least recently used entry if full."""
+        key = self.key(board, extra)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every cached value."""
+        self._entries.clear()
+
+def canonical_cache(max_size=100000):
+    """
+    Memoize a function of a board across the board's symmetries.
+    
+    The decorated function is called as function(board, *args), and its
+    other arguments become part of the key, so they must be hashable. Its
+    CanonicalCache is available as the cache attribute of the wrapper.
+    
+    Args:
+        max_size (int): The most positions to keep before evicting the least
+                        recently used
+    
+    Returns:
+        callable: The decorator
+    """
+    def decorator(function):
+        cache = CanonicalCache(max_size)
+        missing = object()
+        
+        @functools.wraps(function)
+        def wrapper(board, *args):
+            value = cache.get(board, missing, args)
+            if value is missing:
+                value = function(board, *args)
+                cache.put(board, value, args)
+            return value
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
\ No newline at end of file
@@ -0,0 +1,170 @@
+import mmap
+import os
+import sys
+
+from board import symmetries, win_lines
+
+DEFAULT_TABLEBASE_FILE = "tablebase_3x3.bin"
+
+# File layout: a header followed by one byte per base-3 position code
+_MAGIC = b"TTTB"
+_VERSION = 1
+_SIZE = 3
+_CELLS = _SIZE * _SIZE
+_POSITIONS = 3 ** _CELLS
+_HEADER = _MAGIC + bytes((_VERSION, _SIZE))
+
+# Entry encoding: the value in the high bits, the best move in the low four
+_MISSING = 0xFF
+_NO_MOVE = 0x0F
+
+# Position values for the player to move
+LOSS = -1
+DRAW = 0
+WIN = 1
+
+_POWERS = [3 ** cell for cell in range(_CELLS)]
+_LINES = win_lines(_SIZE)
+_SYMMETRIES = symmetries(_SIZE)
+
+def _encode(cells, perm):
+    """Get the base-3 code of a cell list transformed by perm."""
+    code = 0
+    for cell, value in enumerate(cells):
+        if value:
+            code += value * _POWERS[perm[cell]]
+    return code
+
+def _canonical(cells):
+    """Get the smallest code over all symmetries and the symmetry that gives it."""
+    best_code, best_index = None, None
+    for index, perm in enumerate(_SYMMETRIES):
+        code = _encode(cells, perm)
+        if best_code is None or code < best_code:
+            best_code, best_index = code, index
+    return best_code, best_index
+
+def _has_won(cells, value):
+    return any(all(cells[cell] == value for cell in line) for line in _LINES)
+
+def build_tablebase(path=DEFAULT_TABLEBASE_FILE):
+    """
+    Solve every reachable 3x3 position and write the results to a file.
+    
+    Positions that are rotations or reflections of each other are solved
+    once and stored under the smallest of their codes. Each stored entry
+    holds the perfect-play value for the player to move and a best move in
+    the orientation of that code.
+    
+    Args:
+        path (str): The file to write
+    
+    Returns:
+        int: The number of positions stored
+    """
+    table = bytearray([_MISSING]) * _POSITIONS
+    
+    def solve(cells, mover, opponent):
+        code, index = _canonical(cells)
+        entry = table[code]
+        if entry != _MISSING:
+            return (entry >> 4) - 1
+        
+        if _has_won(cells, opponent):
+            value, best = LOSS, None
+        elif all(cells):
+            value, best = DRAW, None
+        else:
+            value, best = None, None
+            for cell in range(_CELLS):
+                if not cells[cell]:
+                    cells[cell] = mover
+                    result = -solve(cells, opponent, mover)
+                    cells[cell] = 0
+                    if value is None or result > value:
+                        value, best = result, cell
+        
+        # Store the move in the orientation of the canonical code
+        move = _NO_MOVE if best is None else _SYMMETRIES[index][best]
+        table[code] = ((value + 1) << 4) | move
+        return value
+    
+    solve([0] * _CELLS, 1, 2)
+    
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER)
+        f.write(table)
+    os.replace(temp_path, path)
+    return sum(1 for entry in table if entry != _MISSING)
+
+class Tablebase:
+    """
+    A read-only, memory-mapped 3x3 perfect-play tablebase.
+    
+    The file is mapped rather than read, so every process that opens it
+    shares the same pages and nothing is rebuilt at startup. Lookups cost a
+    fixed number of operations.
+    """
+    def __init__(self, path=DEFAULT_TABLEBASE_FILE):
+        self._file = open(path, "rb")
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        if self._data[:len(_HEADER)] != _HEADER or len(self._data) != len(_HEADER) + _POSITIONS:
+            self.close()
+            raise ValueError(f"{path} is not a 3x3 tablebase file")
+    
+    def lookup(self, board, symbols=('X', 'O')):
+        """
+        Look up a position.
+        
+        Args:
+            board (Board): A 3x3 board where three in a row wins
+            symbols (tuple): The symbols of the first and second player
+        
+        Returns:
+            tuple or None: A (value, move) pair, where value is WIN, DRAW or
+                           LOSS for the player to move and move is a (row, col)
+                           position or None if the game is over. None if the
+                           board isn't a reachable 3x3 position.
+        """
+        if board.size != _SIZE or board.win_length != _SIZE:
+            return None
+        
+        first = board.get_bits(symbols[0])
+        second = board.get_bits(symbols[1])
+        cells = [(first >> cell & 1) | (second >> cell & 1) << 1 for cell in range(_CELLS)]
+        code, index = _canonical(cells)
+        entry = self._data[len(_HEADER) + code]
+        if entry == _MISSING:
+            return None
+        
+        value = (entry >> 4) - 1
+        move = entry & 0x0F
+        if move == _NO_MOVE:
+            return value, None
+        cell = _SYMMETRIES[index].index(move)
+        return value, divmod(cell, _SIZE)
+    
+    def close(self):
+        """Unmap and close the tablebase file."""
+        self._data.close()
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def main():
+    """Build the tablebase file given on the command line."""
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TABLEBASE_FILE
+    count = build_tablebase(path)
+    print(f"Wrote {count} positions to {path}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,420 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from simulate import play_game
+from strategies import available_strategies, close_player, create_player
+
+ROUND_ROBIN = "round-robin"
+SWISS = "swiss"
+
+# Game results, from the point of view of the board
+X_WINS = "x"
+O_WINS = "o"
+DRAW = "draw"
+
+_CHECKPOINT_VERSION = 1
+
+def play_tournament_game(x_strategy, o_strategy, board_size=3, win_length=None, seed=None):
+    """
+    Play one tournament game in the current process.
+    
+    Returns:
+        tuple: The result (X_WINS, O_WINS or DRAW) and the number of moves
+    """
+    rng = random.Random(seed)
+    player1 = create_player(x_strategy, 'X', seed=rng.getrandbits(32))
+    player2 = create_player(o_strategy, 'O', seed=rng.getrandbits(32))
+    try:
+        game = play_game(player1, player2, board_size, win_length)
+    finally:
+        close_player(player1)
+        close_player(player2)
+    
+    if game.winner is player1:
+        result = X_WINS
+    elif game.winner is player2:
+        result = O_WINS
+    else:
+        result = DRAW
+    return result, len(game.history)
+
+class EloTable:
+    """
+    Elo ratings and win/draw/loss records, updated one game at a time.
+    
+    Attributes:
+        k (float): The most a rating can change in one game
+        initial (float): The rating of a new player
+    """
+    def __init__(self, k=24, initial=1500):
+        self._k = k
+        self._initial = initial
+        self._players = {}
+    
+    def add_player(self, name):
+        """Add a player with the initial rating if they aren't in the table yet."""
+        if name not in self._players:
+            self._players[name] = {"rating": float(self._initial), "wins": 0, "draws": 0,
+                                   "losses": 0, "points": 0.0}
+    
+    def rating(self, name):
+        """Get a player's current rating."""
+        return self._players[name]["rating"]
+    
+    def points(self, name):
+        """Get a player's points, 1 for each win and a half for each draw."""
+        return self._players[name]["points"]
+    
+    def expected_score(self, name, opponent):
+        """Get the score name is expected to make against opponent, from 0 to 1."""
+        difference = self.rating(opponent) - self.rating(name)
+        return 1 / (1 + 10 ** (difference / 400))
+    
+    def record(self, x_name, o_name, result):
+        """
+        Update the table with the result of a game.
+        
+        Args:
+            x_name (str): The player who played X
+            o_name (str): The player who played O
+            result (str): X_WINS, O_WINS or DRAW
+        """
+        self.add_player(x_name)
+        self.add_player(o_name)
+        score = {X_WINS: 1.0, O_WINS: 0.0, DRAW: 0.5}[result]
+        change = self._k * (score - self.expected_score(x_name, o_name))
+        
+        x_stats, o_stats = self._players[x_name], self._players[o_name]
+        x_stats["rating"] += change
+        o_stats["rating"] -= change
+        x_stats["points"] += score
+        o_stats["points"] += 1 - score
+        if result == X_WINS:
+            x_stats["wins"] += 1
+            o_stats["losses"] += 1
+        elif result == O_WINS:
+            o_stats["wins"] += 1
+            x_stats["losses"] += 1
+        else:
+            x_stats["draws"] += 1
+            o_stats["draws"] += 1
+    
+    def award_points(self, name, points):
+        """Give a player points without a game, as for a bye."""
+        self.add_player(name)
+        self._players[name]["points"] += points
+    
+    def standings(self):
+        """
+        Get the players ordered by rating.
+        
+        Returns:
+            list: A dict per player with 'name', 'rating', 'points', 'wins',
+                  'draws', 'losses' and 'games'
+        """
+        rows = []
+        for name, stats in self._players.items():
+            row = dict(stats, name=name)
+            row["games"] = stats["wins"] + stats["draws"] + stats["losses"]
+            rows.append(row)
+        rows.sort(key=lambda row: (-row["rating"], row["name"]))
+        return rows
+
+class Tournament:
+    """
+    A tournament between registered strategies.
+    
+    In a round-robin tournament every pair of strategies plays
+    games_per_pair games. In a Swiss tournament each round pairs strategies
+    with similar scores that haven't met yet, and the pairings of a round
+    are made once the previous round is finished; with an odd number of
+    strategies the lowest ranked one without a bye sits out and scores as
+    if it had won its games. In both formats the players of a pairing take
+    turns playing X.
+    
+    Games run in parallel worker processes. Results are applied to the Elo
+    table in schedule order as they arrive, so ratings don't depend on
+    which worker finishes first, and every completed game is saved to the
+    checkpoint file, if one is given, from which an interrupted tournament
+    carries on.
+    """
+    def __init__(self, strategies, tournament_format=ROUND_ROBIN, games_per_pair=2, rounds=None,
+                 board_size=3, win_length=None, seed=0, checkpoint=None, checkpoint_interval=5.0,
+                 k=24):
+        if len(strategies) < 2:
+            raise ValueError("A tournament needs at least two strategies")
+        if len(set(strategies)) != len(strategies):
+            raise ValueError("Each strategy can only enter a tournament once")
+        unknown = [strategy for strategy in strategies if strategy not in available_strategies()]
+        if unknown:
+            raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+        if tournament_format not in (ROUND_ROBIN, SWISS):
+            raise ValueError(f"Unknown tournament format '{tournament_format}'")
+        if games_per_pair < 1:
+            raise ValueError("games_per_pair must be at least 1")
+        
+        if rounds is None:
+            rounds = math.ceil(math.log2(len(strategies))) if tournament_format == SWISS else 1
+        self._config = {
+            "strategies": list(strategies),
+            "format": tournament_format,
+            "games_per_pair": games_per_pair,
+            "rounds": rounds,
+            "board_size": board_size,
+            "win_length": win_length,
+            "seed": seed,
+            "k": k
+        }
+        self._checkpoint = checkpoint
+        self._checkpoint_interval = checkpoint_interval
+        self._results = []
+        self._byes = []
+        self._table = self._new_table()
+    
+    @property
+    def config(self):
+        return dict(self._config)
+    
+    @property
+    def games_played(self):
+        return len(self._results)
+    
+    def standings(self):
+        """Get the current standings, as from EloTable.standings()."""
+        return self._table.standings()
+    
+    def _new_table(self):
+        table = EloTable(self._config["k"])
+        for strategy in self._config["strategies"]:
+            table.add_player(strategy)
+        return table
+    
+    def run(self, workers=None, progress=None):
+        """
+        Play every game of the tournament that hasn't been played yet.
+        
+        Args:
+            workers (int or None): The number of worker processes (defaults
+                                   to the number of CPUs, 1 plays in this process)
+            progress (callable or None): Called as progress(tournament) after
+                                         each round
+        
+        Returns:
+            list: The final standings
+        """
+        if self._checkpoint and os.path.exists(self._checkpoint):
+            self._load_checkpoint()
+        
+        workers = workers if workers else os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for round_number in range(self._config["rounds"]):
+                games = self._schedule_round(round_number)
+                self._play(games, executor)
+                if progress is not None:
+                    progress(self)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            self._save_checkpoint()
+        return self.standings()
+    
+    def _schedule_round(self, round_number):
+        """
+        Get the games of a round.
+        
+        Returns:
+            list: A (round, number, x_strategy, o_strategy, seed) tuple per game
+        """
+        strategies = self._config["strategies"]
+        if self._config["format"] == ROUND_ROBIN:
+            pairs = [(strategies[i], strategies[j])
+                     for i in range(len(strategies)) for j in range(i + 1, len(strategies))]
+        else:
+            pairs = self._swiss_pairs(round_number)
+        
+        games = []
+        for first, second in pairs:
+            for game in range(self._config["games_per_pair"]):
+                x, o = (first, second) if game % 2 == 0 else (second, first)
+                number = len(games)
+                seed = random.Random(f"{self._config['seed']}:{round_number}:{number}").getrandbits(32)
+                games.append((round_number, number, x, o, seed))
+        return games
+    
+    def _swiss_pairs(self, round_number):
+        """Pair the strategies for a Swiss round by their scores after the earlier rounds."""
+        # Only earlier rounds count, so a resumed round gets the same pairings
+        table = self._new_table()
+        played = set()
+        for result in self._results:
+            if result["round"] < round_number:
+                table.record(result["x"], result["o"], result["result"])
+                played.add(frozenset((result["x"], result["o"])))
+        for bye in self._byes:
+            if bye["round"] < round_number:
+                table.award_points(bye["player"], self._config["games_per_pair"])
+        
+        ranked = sorted(self._config["strategies"],
+                        key=lambda name: (-table.points(name), -table.rating(name), name))
+        
+        # The lowest ranked strategy that hasn't had a bye sits this round out
+        if len(ranked) % 2:
+            bye_round = [bye for bye in self._byes if bye["round"] == round_number]
+            if bye_round:
+                bye = bye_round[0]["player"]
+            else:
+                had_bye = {bye["player"] for bye in self._byes}
+                bye = next((name for name in reversed(ranked) if name not in had_bye), ranked[-1])
+                self._byes.append({"round": round_number, "player": bye})
+                self._table.award_points(bye, self._config["games_per_pair"])
+            ranked.remove(bye)
+        
+        pairs = []
+        while ranked:
+            first = ranked.pop(0)
+            # Prefer the closest ranked opponent not met yet
+            opponent = next((name for name in ranked if frozenset((first, name)) not in played),
+                            ranked[0])
+            ranked.remove(opponent)
+            pairs.append((first, opponent))
+        return pairs
+    
+    def _play(self, games, executor):
+        """Play the games not played yet and apply their results in schedule order."""
+        done = {(result["round"], result["number"]) for result in self._results}
+        games = [game for game in games if (game[0], game[1]) not in done]
+        if not games:
+            return
+        
+        finished = {}
+        next_index = 0
+        last_checkpoint = time.monotonic()
+        
+        def apply_finished():
+            nonlocal next_index
+            while next_index < len(games) and next_index in finished:
+                round_number, number, x, o, _ = games[next_index]
+                result, moves = finished.pop(next_index)
+                self._results.append({"round": round_number, "number": number, "x": x, "o": o,
+                                      "result": result, "moves": moves})
+                self._table.record(x, o, result)
+                next_index += 1
+        
+        if executor is None:
+            for index, (_, _, x, o, seed) in enumerate(games):
+                finished[index] = play_tournament_game(x, o, self._config["board_size"],
+                                                       self._config["win_length"], seed)
+                apply_finished()
+                if time.monotonic() - last_checkpoint >= self._checkpoint_interval:
+                    self._save_checkpoint()
+                    last_checkpoint = time.monotonic()
+            return
+        
+        futures = {
+            executor.submit(play_tournament_game, x, o, self._config["board_size"],
+                            self._config["win_length"], seed): index
+            for index, (_, _, x, o, seed) in enumerate(games)
+        }
+        pending = set(futures)
+        while pending:
+            completed, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finished[futures[future]] = future.result()
+            apply_finished()
+            if time.monotonic() - last_checkpoint >= self._checkpoint_interval:
+                self._save_checkpoint()
+                last_checkpoint = time.monotonic()
+    
+    def _save_checkpoint(self):
+        """Write the results so far to the checkpoint file, replacing it atomically."""
+        if not self._checkpoint:
+            return
+        state = {
+            "version": _CHECKPOINT_VERSION,
+            "config": self._config,
+            "results": self._results,
+            "byes": self._byes,
+            "standings": self.standings()
+        }
+        temporary = self._checkpoint + ".tmp"
+        try:
+            with open(temporary, "w") as f:
+                json.dump(state, f, indent=1)
+            os.replace(temporary, self._checkpoint)
+        except Exception as e:
+            print(f"Error writing checkpoint: {e}")
+    
+    def _load_checkpoint(self):
+        """Restore the results of an earlier run and replay them into the ratings."""
+        with open(self._checkpoint) as f:
+            state = json.load(f)
+        if state.get("version") != _CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self._checkpoint}")
+        if state["config"] != self._config:
+            raise ValueError(f"The checkpoint {self._checkpoint} is for a different tournament")
+        
+        self._results = []
+        self._byes = state["byes"]
+        self._table = self._new_table()
+        byes = {bye["round"]: bye["player"] for bye in self._byes}
+        for result in state["results"]:
+            # Byes were awarded before the games of their round were paired
+            if result["round"] in byes:
+                self._table.award_points(byes.pop(result["round"]), self._config["games_per_pair"])
+            self._results.append(result)
+            self._table.record(result["x"], result["o"], result["result"])
+        for player in byes.values():
+            self._table.award_points(player, self._config["games_per_pair"])
+
+def format_standings(standings):
+    """Format tournament standings as a text table."""
+    lines = [f"{'#':>3} {'strategy':<16} {'rating':>8} {'points':>8} {'W':>6} {'D':>6} {'L':>6}"]
+    for place, row in enumerate(standings, 1):
+        lines.append(f"{place:3d} {row['name']:<16} {row['rating']:8.1f} {row['points']:8.1f} "
+                     f"{row['wins']:6d} {row['draws']:6d} {row['losses']:6d}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Parse the command line and run a tournament."""
+    strategies = available_strategies()
+    parser = argparse.ArgumentParser(description="Run a tournament between computer strategies.")
+    parser.add_argument("strategies", nargs="*", default=strategies,
+                        help=f"strategies to enter (default: all of {', '.join(strategies)})")
+    parser.add_argument("--format", choices=[ROUND_ROBIN, SWISS], default=ROUND_ROBIN,
+                        help="how games are paired")
+    parser.add_argument("--games", type=int, default=10,
+                        help="games per pairing, alternating who plays X")
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="rounds of a Swiss tournament (default: log2 of the entrants)")
+    parser.add_argument("--size", type=int, default=3, help="board size")
+    parser.add_argument("--win-length", type=int, default=None,
+                        help="marks in a row needed to win (defaults to the board size)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (defaults to the number of CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--checkpoint", default=None,
+                        help="save progress to this file and resume from it if it exists")
+    args = parser.parse_args(argv)
+    
+    try:
+        tournament = Tournament(args.strategies, args.format, args.games, args.rounds,
+                                args.size, args.win_length, args.seed, args.checkpoint)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    def progress(tournament):
+        print(f"{tournament.games_played} games played")
+    
+    start = time.perf_counter()
+    standings = tournament.run(args.workers, progress)
+    print(format_standings(standings))
+    print(f"Finished in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,5 +1,19 @@
+import time
+
 import pygame
 
+from render_cache import render_text
+
+def get_ticks():
+    """
+    Get the milliseconds on a monotonic clock.
+    
+    Unlike pygame.time.get_ticks, this works when only some pygame
+    subsystems have been initialized.
+    """
+    return int(time.monotonic() * 1000)
+
+
 class TextInput:
     """
     A class for handling text input in Pygame.
@@ -11,7 +25,7 @@ class TextInput:
         self.font = font
         self.active = False
         self.cursor_visible = True
-        self.cursor_timer = 0
+        self.cursor_timer = get_ticks()  # ticks of the last blink
         self.cursor_blink_rate = 500  # milliseconds
     
     def handle_event(self, event):
@@ -33,11 +47,23 @@ class TextInput:
         return False
     
     def update(self):
-        """Update the cursor blink state."""
-        self.cursor_timer += 1
-        if self.cursor_timer >= self.cursor_blink_rate / 16.67:  # Convert ms to frames at 60fps
+        """
+        Update the cursor blink state.
+        
+        Returns:
+            bool: True if the cursor was shown or hidden in an active input,
+                  so the input needs redrawing
+        """
+        now = get_ticks()
+        if now - self.cursor_timer >= self.cursor_blink_rate:
             self.cursor_visible = not self.cursor_visible
-            self.cursor_timer = 0
+            self.cursor_timer = now
+            return self.active
+        return False
+    
+    def time_until_blink(self):
+        """Get the number of milliseconds until the cursor next blinks."""
+        return max(0, self.cursor_blink_rate - (get_ticks() - self.cursor_timer))
     
     def draw(self, screen):
         """Draw the text input box and text."""
@@ -47,7 +73,7 @@ class TextInput:
         pygame.draw.rect(screen, border_color, self.rect, 2)
         
         # Render text
-        text_surf = self.font.render(self.text, True, self.color)
+        text_surf = render_text(self.font, self.text, self.color)
         
         # Position text
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 5, self.rect.centery))
@@ -89,7 +115,7 @@ class Button:
         pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=5)
         
         # Draw text
-        text_surf = self.font.render(self.text, True, text_color)
+        text_surf = render_text(self.font, self.text, text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
     